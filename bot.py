@@ -4,20 +4,33 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
-import json
 import random
+import re
 import os
+import time
+import functools
+import logging
 import pytz
 import aiohttp
 from discord import Attachment
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from sheets import get_tile_data, get_max_tile
+from sheets import get_board, list_boards, board_slug
+from media import prepare_submission, SubmissionRejected
+from state import StateStore, DEFAULT_BOARD
+from tiles import get_templates
+from history import HistoryStore
+from capture import recorder as trace_recorder
+from export import Exporter
+from webclient import close_session
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
 # Global data dicts and variables
-pending_submissions = {}  # {(guild_id:int, user_id:int): {tile, task, target, drop_rate, message_id, channel_id}}
+pending_submissions = {}  # {(guild_id:int, user_id:int, board:str): {tile, task, target, drop_rate, message_id, channel_id, submitted_at, generation}}
 
 # --- CONFIGURATION ---
 SNL_ROLE = "SNL"
@@ -26,8 +39,10 @@ SUBMISSION_CHANNEL = "snl-submissions"
 ADMIN_CHANNEL = "snl-admin"
 CHAT_CHANNEL = "snl-chat"
 SNL_COMMANDS_CHANNEL = "snl-commands"
+ACK_BUDGET = 2.0  # Seconds a command may run before it's auto-deferred (Discord's hard limit is 3)
+SHUTDOWN_EXPORT_TIMEOUT = 10.0  # Seconds to spend sending queued exports when the bot stops
 TIMEZONE_OFFSET = 10  # Melbourne is UTC+10 or UTC+11 with daylight saving
-WEB_APP_URL="https://script.google.com/macros/s/AKfycbxCnpUEMVkujBNDBbcaD14Nf57R7HrvPp9uR0_d36U0s9oeGIV96wsq9GanZrT6-9ZO/exec"
+WEB_APP_URL=os.getenv("SNL_EXPORT_URL") or "https://script.google.com/macros/s/AKfycbxCnpUEMVkujBNDBbcaD14Nf57R7HrvPp9uR0_d36U0s9oeGIV96wsq9GanZrT6-9ZO/exec"  # Set SNL_EXPORT_URL to point exports elsewhere, e.g. a local stand-in
 
 
 # --- INIT BOT ---
@@ -37,22 +52,35 @@ intents.guilds = True
 intents.members = True
 intents.reactions = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+class SNLBot(commands.Bot):
+    async def close(self):
+        """Sends what the exporter still has queued and closes the shared HTTP session before disconnecting."""
+        try:
+            await asyncio.wait_for(exporter.stop(), timeout=SHUTDOWN_EXPORT_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("Gave up sending queued exports on shutdown.")
+        await close_session()
+        await super().close()
+
+bot = SNLBot(command_prefix="!", intents=intents)
 
-data_file = "data.json"
+data_file = "data.json"  # Old single-file state, migrated into state_dir on first start
+state_dir = "guilds"
+STATE_CACHE_SIZE = int(os.getenv("SNL_STATE_CACHE", "64"))  # Guilds kept in memory at once
 
 # --- LOAD / SAVE ---
 def load_data():
-    if os.path.exists(data_file):
-        with open(data_file, "r") as f:
-            return json.load(f)
-    return {"positions": {}, "rolls": {}, "approvals": {}, "podium": {}}
+    return StateStore(state_dir, legacy_file=data_file, capacity=STATE_CACHE_SIZE)
 
-def save_data():
-    with open(data_file, "w") as f:
-        json.dump(data, f, indent=4)
+def save_data(game):
+    """Persists one guild's partition."""
+    data.save(game)
 
 data = load_data()
+history = HistoryStore("history", capacity=STATE_CACHE_SIZE)
+exporter = Exporter(WEB_APP_URL)
+HISTORY_DEFAULT_COUNT = 10
+HISTORY_MAX_COUNT = 25
 
 # --- TIME HELPERS ---
 def seconds_until(hour: int):
@@ -85,6 +113,12 @@ def next_midnight_melbourne():
     delta = next_midnight - now
     return delta
 
+def time_until_midnight() -> str:
+    """Time left until the next midnight in Melbourne, without microseconds."""
+    now = datetime.now(pytz.timezone("Australia/Melbourne"))
+    next_reset = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return str(next_reset - now).split(".")[0]
+
 # --- BACKGROUND TASK ---
 @tasks.loop(hours=12)
 async def grant_daily_rolls():
@@ -103,22 +137,21 @@ async def grant_daily_rolls():
         role = discord.utils.get(guild.roles, name=SNL_ROLE)
         if not role:
             continue
-        guild_id = str(guild.id)
-        data.setdefault("rolls", {}).setdefault(guild_id, {})
-        data.setdefault("approvals", {}).setdefault(guild_id, {})
-
-        for member in role.members:
-            user_id = str(member.id)
-            data["rolls"][guild_id].setdefault(user_id, 0)
-            data["rolls"][guild_id][user_id] += 1
-            data["approvals"][guild_id].setdefault(user_id, True)
+        # Every board this guild has a game on gets the roll
+        for board_name in data.boards(guild.id) or [DEFAULT_BOARD]:
+            game = data.game(guild.id, board_name)
+            for member in role.members:
+                player = game.player(member.id)
+                player.rolls += 1
+                exporter.player_changed(game, player)
+            data.mark_dirty(game)
 
         # Post announcement in SNL-chat if it exists
         channel = discord.utils.get(guild.text_channels, name="snl-chat")
         if channel:
             await channel.send(announcement)
 
-    save_data()
+    data.flush()
     print("Daily rolls granted.")
 
 @grant_daily_rolls.before_loop
@@ -146,21 +179,208 @@ def is_snl_commands_channel(interaction: discord.Interaction) -> bool:
 def can_use_command(interaction: discord.Interaction, role_name: str) -> bool:
     return discord.utils.get(interaction.user.roles, name=role_name) is not None
 
-def format_tile_message(user: discord.Member, tile_data: dict, rolled: int = None, from_tile: int = None, to_tile: int = None, snake_ladder: str = ""):
-    if not tile_data:
+async def fetch_board(board: str = DEFAULT_BOARD) -> dict:
+    """get_board() in a worker thread, so a slow sheet can't stall the event loop."""
+    return await asyncio.to_thread(get_board, board)
+
+async def fetch_board_names() -> list:
+    return await asyncio.to_thread(list_boards)
+
+async def open_game(interaction: discord.Interaction, board: str = None):
+    """
+    Returns this guild's game on the named board (the default board if none is given).
+    If there's no such board, tells the user and returns None.
+    """
+    name = board_slug(board) if board else DEFAULT_BOARD
+    if name != DEFAULT_BOARD:
+        names = await fetch_board_names()
+        if name not in names:
+            await respond(interaction, f"There is no board called `{board}`. Boards: {', '.join(f'`{n}`' for n in names)}", ephemeral=True)
+            return None
+    return data.game(interaction.guild.id, name)
+
+async def board_autocomplete(interaction: discord.Interaction, current: str):
+    names = await fetch_board_names()
+    current = current.lower()
+    return [app_commands.Choice(name=name, value=name) for name in names if current in name][:25]
+
+def board_label(game) -> str:
+    """Suffix naming the board in messages, empty for the default board."""
+    return "" if game.board == DEFAULT_BOARD else f" on **{game.board}**"
+
+# --- COMMAND FRAMEWORK ---
+_ack_locks = {}  # {interaction_id: asyncio.Lock} for commands in flight, guards the single initial response
+_ack_ephemeral = {}  # {interaction_id: bool} visibility chosen by handlers whose replies differ per branch
+
+def set_reply_visibility(interaction: discord.Interaction, ephemeral: bool):
+    """Tells the auto-defer watchdog how visible the handler's reply will be. Call it before the next slow await."""
+    _ack_ephemeral[interaction.id] = ephemeral
+
+async def respond(interaction: discord.Interaction, content=None, **kwargs):
+    """Sends a reply as the initial response, or as a followup once the interaction has been acknowledged."""
+    lock = _ack_locks.get(interaction.id)
+    if lock is None:
+        lock = asyncio.Lock()
+    async with lock:
+        if interaction.response.is_done():
+            await interaction.followup.send(content, **kwargs)
+        else:
+            await interaction.response.send_message(content, **kwargs)
+
+async def _auto_defer(interaction: discord.Interaction, ephemeral: bool, timings: dict):
+    """Defers the interaction if the handler hasn't responded by the end of the ack budget."""
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    # Clamped, since a local clock behind Discord's would otherwise sleep past the deadline
+    await asyncio.sleep(min(ACK_BUDGET, max(0.0, ACK_BUDGET - elapsed)))
+    async with _ack_locks[interaction.id]:
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=_ack_ephemeral.get(interaction.id, ephemeral))
+            timings["acked"] = time.perf_counter()
+            timings["auto_deferred"] = True
+
+def snl_command(name: str, description: str, host_only: bool = False, defer: bool = False, ephemeral: bool = False):
+    """
+    Registers a slash command that only runs in #snl-commands (and only for hosts if host_only).
+    The handler is acknowledged up front if defer=True, otherwise auto-deferred once ACK_BUDGET
+    runs out, with `ephemeral` unless the handler picked otherwise via set_reply_visibility().
+    Handlers reply through respond(). Each phase is timed and logged.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+            start = time.perf_counter()
+            timings = {"auto_deferred": False}
+
+            if not is_snl_commands_channel(interaction):
+                await interaction.response.send_message(f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.", ephemeral=True)
+                return
+            if host_only and not can_use_command(interaction, SNL_HOST_ROLE):
+                await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+                return
+            checked = time.perf_counter()
+
+            _ack_locks[interaction.id] = asyncio.Lock()
+            watchdog = None
+            try:
+                if defer:
+                    await interaction.response.defer(ephemeral=ephemeral)
+                    timings["acked"] = time.perf_counter()
+                else:
+                    watchdog = asyncio.create_task(_auto_defer(interaction, ephemeral, timings))
+                await func(interaction, *args, **kwargs)
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+                _ack_locks.pop(interaction.id, None)
+                _ack_ephemeral.pop(interaction.id, None)
+                done = time.perf_counter()
+                deferred = f", deferred after {(timings['acked'] - checked) * 1000:.0f}ms" if "acked" in timings else ""
+                logger.info(
+                    f"/{name}: checks {(checked - start) * 1000:.0f}ms, "
+                    f"handler {(done - checked) * 1000:.0f}ms"
+                    f"{deferred}{' (auto)' if timings['auto_deferred'] else ''}"
+                )
+
+        return bot.tree.command(name=name, description=description)(wrapper)
+    return decorator
+
+def outstanding_approvals_embed(guild: discord.Guild, title: str):
+    """Lists every submission in the guild still waiting for a host, or returns None if there are none."""
+    lines = []
+    # Only include users with pending approval who have a stored submission message
+    for (g_id, u_id, board_name), info in pending_submissions.items():
+        if g_id != guild.id:
+            continue
+        game = data.game(g_id, board_name)
+        pending = game.get(u_id)
+        user = guild.get_member(u_id)
+        if pending is None or pending.approved or not user or info["generation"] != game.generation:
+            continue
+        jump_url = f"https://discord.com/channels/{g_id}/{info['channel_id']}/{info['message_id']}"
+        board_text = "" if board_name == DEFAULT_BOARD else f" [{board_name}]"
+        lines.append(
+            f"🔸 {user.mention} — Tile {info['tile']}{board_text}, {info['task']} from {info['target']} ({info['drop_rate']}) — [Jump to Submission]({jump_url})"
+        )
+
+    if not lines:
+        return None
+    return discord.Embed(title=title, description="\n".join(lines), color=discord.Color.orange())
+
+def apply_approval(guild_id: int, user_id: int, board_name: str, host_id: int):
+    """
+    Approves one pending submission in memory and returns its game, or None if there was
+    nothing to approve. The caller saves the game, so a batch of approvals is one write.
+    """
+    game = data.game(guild_id, board_name)
+    key = (guild_id, user_id, board_name)
+    info = pending_submissions.get(key)
+    if info is not None and info["generation"] != game.generation:
+        # Submitted in a game that has since been reset
+        del pending_submissions[key]
+        return None
+
+    player = game.get(user_id)
+    if player is None or player.approved:
+        return None
+
+    # Remove from pending_submissions since approved
+    pending_submissions.pop(key, None)
+
+    # Mark as approved
+    player.approved = True
+    if info is not None:
+        game.stats.record_approval(time.time() - info["submitted_at"])
+    exporter.player_changed(game, player)
+    history.record(guild_id, user_id, "approve", board=board_name, tile=player.position, by=str(host_id))
+    return game
+
+async def post_admin_update(guild: discord.Guild):
+    """Sends the updated outstanding approvals embed to #snl-admin."""
+    admin_channel = discord.utils.get(guild.text_channels, name=ADMIN_CHANNEL)
+    if admin_channel:
+        embed = outstanding_approvals_embed(guild, "📋 Updated Outstanding Approvals")
+        if embed is None:
+            embed = discord.Embed(
+                title="✅ All submissions have been approved!",
+                color=discord.Color.green()
+            )
+        await admin_channel.send(embed=embed)
+
+def format_history_event(event: dict) -> str:
+    """One line of /history output for a recorded event."""
+    when = f"<t:{event['ts']}:R>"
+    kind = event["kind"]
+    if kind == "roll":
+        text = f"🎲 Rolled a {event['roll']}: Tile {event['from']} → Tile {event['to']}"
+    elif kind == "ladder":
+        text = f"🪜 Climbed a ladder: Tile {event['from']} → Tile {event['to']}"
+    elif kind == "snake":
+        text = f"🐍 Slid down a snake: Tile {event['from']} → Tile {event['to']}"
+    elif kind == "finish":
+        text = f"🏁 Finished the board in position #{event['place']}"
+    elif kind == "approve":
+        text = f"✅ Tile {event['tile']} approved by <@{event['by']}>"
+    elif kind == "setpos":
+        text = f"🛠️ Moved from Tile {event['from']} to Tile {event['to']} by <@{event['by']}>"
+    elif kind == "addroll":
+        text = f"➕ {event['amount']} roll(s) added by <@{event['by']}>"
+    elif kind == "removeroll":
+        text = f"➖ {event['amount']} roll(s) removed by <@{event['by']}>"
+    else:
+        text = kind
+    board_name = event.get("board", DEFAULT_BOARD)
+    if board_name != DEFAULT_BOARD:
+        text += f" [{board_name}]"
+    return f"{when} {text}"
+
+def format_tile_message(user: discord.Member, template, rolled: int = None, from_tile: int = None, to_tile: int = None, snake_ladder: str = ""):
+    """Fills the player-specific text in around a precompiled TileTemplate."""
+    if not template:
         content = f"{user.mention}, there was an issue fetching tile data."
         embed = discord.Embed(title="Tile Data Missing", color=discord.Color.red())
         return content, embed
 
-    embed = discord.Embed(title=f"Tile {tile_data['Tile']}", color=discord.Color.gold())
-    embed.add_field(name="Target", value=tile_data["Target"], inline=True)
-    embed.add_field(name="Task", value=tile_data["Task"], inline=True)
-    embed.add_field(name="Drop Rate", value=tile_data["Drop Rate"], inline=True)
-
-    image_url = tile_data.get("Image")
-
-    if image_url and isinstance(image_url, str) and image_url.startswith("http"):
-        embed.set_image(url=image_url)
+    embed = template.make_embed()
 
     if rolled is not None:
         if snake_ladder == "ladder":
@@ -171,59 +391,38 @@ def format_tile_message(user: discord.Member, tile_data: dict, rolled: int = Non
             content = f"{user.mention} has rolled a {rolled}!\n"
         content += f"You moved from Tile {from_tile} to Tile {to_tile}."
     else:
-        content = f"{user.mention}, your current position is Tile {tile_data['Tile']}."
+        content = f"{user.mention}, your current position is Tile {template.tile}."
 
     return content, embed
 
 # /roll
-@bot.tree.command(name="roll", description="Roll the dice (1–6) to move along the board")
-async def roll(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        # This message will be visible only to the user.
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=False  # Only visible to the user
-        )
+@snl_command(name="roll", description="Roll the dice (1–6) to move along the board", ephemeral=True)
+@app_commands.describe(board="Board to play on (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def roll(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
-
-    # Defer response so the bot doesn't timeout while processing.
-    await interaction.response.defer(ephemeral=False)
-
-    user_id = str(interaction.user.id)
-    guild_id = str(interaction.guild.id)
-
-    # Ensure data structures exist
-    data.setdefault("approvals", {}).setdefault(guild_id, {})
-    data.setdefault("rolls", {}).setdefault(guild_id, {})
-    data.setdefault("positions", {}).setdefault(guild_id, {})
-    if "podium" not in data or not isinstance(data["podium"], dict):
-        data["podium"] = {}
-    if guild_id not in data["podium"]:
-        data["podium"][guild_id] = []
-
-    # Default values for user if missing
-    data["approvals"][guild_id].setdefault(user_id, True)
-    data["rolls"][guild_id].setdefault(user_id, 0)
-    data["positions"][guild_id].setdefault(user_id, 1)
+    player = game.player(interaction.user.id)
 
     # Check if the user has finished the game and is in the podium
-    if user_id in data["podium"][guild_id]:
-        podium_position = data["podium"][guild_id].index(user_id) + 1  # 1-based index
+    podium_position = game.podium_place(player.user_id)
+    if podium_position is not None:
         # Send message **only to the user** (ephemeral)
-        await interaction.followup.send(
+        await respond(interaction,
             f"You have finished the current game in position #{podium_position}. Please wait for the next game to roll again.",
             ephemeral=True  # Only visible to the user
         )
         return
 
-    if not data["approvals"][guild_id][user_id]:
-        await interaction.followup.send(
+    if not player.approved:
+        await respond(interaction,
             "You must wait until your last submission is approved before rolling again.",
             ephemeral=True  # Only visible to the user
         )
         return
 
-    if data["rolls"][guild_id][user_id] <= 0:
+    if player.rolls <= 0:
         delta = next_midnight_melbourne()
 
         now = datetime.utcnow() + timedelta(hours=TIMEZONE_OFFSET)
@@ -236,15 +435,28 @@ async def roll(interaction: discord.Interaction):
         next_grant_str = next_time.strftime("%I:%M %p").lstrip("0")
 
         # Ephemeral response, **only the user will see this**
-        await interaction.followup.send(
+        await respond(interaction,
             f"You have no rolls left. ⏭️ Next auto-grant: {str(delta).split('.')[0]}.",
             ephemeral=True  # **Only visible to the user**
         )
         return
 
-    current = data["positions"][guild_id][user_id]
+    # Claim the roll before any await, so a double-clicked /roll can't spend it twice
+    player.rolls -= 1
+    player.approved = False  # Lock until host approves
+
+    current = player.position
     roll_value = random.randint(1, 6)
-    max_tile = get_max_tile()
+    # The result is announced to the channel, so a deferral while the board loads is public too
+    set_reply_visibility(interaction, False)
+    board_data = await fetch_board(game.board)
+    if board_data is None:
+        # The board was removed from the sheet since open_game(); give the roll back
+        player.rolls += 1
+        player.approved = True
+        await respond(interaction, f"The board `{game.board}` is no longer available.")
+        return
+    max_tile = board_data["max_tile"]
     next_tile = current + roll_value
 
     # Bounce-back logic
@@ -253,7 +465,7 @@ async def roll(interaction: discord.Interaction):
         next_tile = max_tile - overflow
 
     # Check for snake or ladder
-    tile_data = get_tile_data(next_tile)
+    tile_data = board_data["tiles"].get(next_tile)
     if tile_data and tile_data["Type"] in ["ladder", "snake"]:
         from_tile = next_tile
         next_tile = tile_data["End Tile"]
@@ -262,110 +474,107 @@ async def roll(interaction: discord.Interaction):
         from_tile = current
         snake_ladder = ""
 
-    data["positions"][guild_id][user_id] = next_tile
-    data["rolls"][guild_id][user_id] -= 1
-    data["approvals"][guild_id][user_id] = False  # Lock until host approves
-    save_data()
+    game.move(player, next_tile)
+
+    game.stats.record_roll(player.user_id, snake_ladder)
+    history.record(game.guild_id, player.user_id, "roll", board=game.board, roll=roll_value, **{"from": current, "to": from_tile if snake_ladder else next_tile})
+    if snake_ladder:
+        history.record(game.guild_id, player.user_id, snake_ladder, board=game.board, **{"from": from_tile, "to": next_tile})
 
     # Special handling if the player reaches tile 100 (or max_tile)
     if next_tile == max_tile:
-        if user_id not in data["podium"][guild_id]:
-            data["podium"][guild_id].append(user_id)
-            save_data()
-        
+        podium_position = game.finish(player.user_id)  # Podium position is based on their finishing order
+        history.record(game.guild_id, player.user_id, "finish", board=game.board, place=podium_position)
+
         # Prevent them from rolling again after finishing
-        data["rolls"][guild_id][user_id] = 0  # Set rolls to 0 once they finish
-        data["approvals"][guild_id][user_id] = True  # Reset approval to True for the next game
-        save_data()
-
-        # Custom message for finishing the game (ephemeral so only the user sees it)
-        podium_position = len(data["podium"][guild_id])  # Podium position is based on their finishing order
-        await interaction.followup.send(
-            f"🎉 You have finished the game! You finished the board in position #{podium_position}!",
-            ephemeral=True  # **This ensures only the player sees it**
+        player.rolls = 0  # Set rolls to 0 once they finish
+        player.approved = True  # Reset approval to True for the next game
+        save_data(game)
+        exporter.player_changed(game, player)
+
+        # Custom message for finishing the game
+        await respond(interaction,
+            f"🎉 You have finished the game! You finished the board in position #{podium_position}!"
         )
     else:
-        final_tile_data = get_tile_data(next_tile)
-        if final_tile_data is None:
-            # Fallback in case get_tile_data fails, to prevent errors
+        save_data(game)
+        exporter.player_changed(game, player)
+
+        template = get_templates(board_data).get(next_tile)
+        if template is None:
+            # Fallback in case the tile is missing from the sheet, to prevent errors
             content = f"{interaction.user.mention}, you moved to Tile {next_tile}."
             embed = None
         else:
-            content, embed = format_tile_message(interaction.user, final_tile_data, rolled=roll_value, from_tile=current, to_tile=next_tile, snake_ladder=snake_ladder)
+            content, embed = format_tile_message(interaction.user, template, rolled=roll_value, from_tile=current, to_tile=next_tile, snake_ladder=snake_ladder)
 
-        # Send the message **only visible to the player who triggered the command**
-        await interaction.followup.send(content, embed=embed, ephemeral=True)  # **Ephemeral so only they see it**
+        # Announce the roll to the channel
+        await respond(interaction, content, embed=embed)
 
 
 
 
 
 # /position
-@bot.tree.command(name="position", description="Check your position on the board")
-async def position(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+@snl_command(name="position", description="Check your position on the board", ephemeral=True)
+@app_commands.describe(board="Board to check (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def position(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
-
-    user_id = str(interaction.user.id)
-    guild_id = str(interaction.guild.id)
-
-    data.setdefault("positions", {}).setdefault(guild_id, {}).setdefault(user_id, 1)
-    data.setdefault("approvals", {}).setdefault(guild_id, {}).setdefault(user_id, False)
-    data.setdefault("rolls", {}).setdefault(guild_id, {}).setdefault(user_id, 0)
-    save_data()
+    player = game.player(interaction.user.id)
 
     # Check if the user's submission is approved
-    if data["approvals"][guild_id][user_id]:
+    if player.approved:
         # No active tile (submission approved)
-        if data["rolls"][guild_id][user_id] <= 0:
+        if player.rolls <= 0:
             # No rolls left, show when the next roll will be available
             delta = next_midnight_melbourne()
             next_grant_str = format_next_grant()
-            await interaction.response.send_message(
+            await respond(interaction,
                 f"You have no active tile. You have no rolls left. ⏭️ Next auto-grant: {str(delta).split('.')[0]}.",
                 ephemeral=True
             )
         else:
             # Rolls available, prompt to use /roll
-            await interaction.response.send_message(
+            await respond(interaction,
                 f"You have no active tile. Use `/roll` to get your next tile assignment.",
                 ephemeral=True
             )
     else:
         # Submission not approved, show the current tile
-        current_tile = data["positions"][guild_id][user_id]
+        current_tile = player.position
         if current_tile == 0:
-            await interaction.response.send_message("You are at the start, use /roll to start the game.", ephemeral=True)
+            await respond(interaction, "You are at the start, use /roll to start the game.", ephemeral=True)
             return
 
-        tile_data = get_tile_data(current_tile)
-        data.setdefault("podium", {}).setdefault(guild_id, [])
-        if current_tile == get_max_tile():
-            if user_id in data["podium"][guild_id]:
-                await interaction.response.send_message(f"You have already finished this round, your podium position is: #{data['podium'][guild_id].index(user_id)+1}")
+        # The tile is shown to the channel, so a deferral while the board loads must be public too
+        set_reply_visibility(interaction, False)
+        board_data = await fetch_board(game.board)
+        if board_data is None:
+            await respond(interaction, f"The board `{game.board}` is no longer available.")
+            return
+        if current_tile == board_data["max_tile"]:
+            podium_position = game.podium_place(player.user_id)
+            if podium_position is not None:
+                await respond(interaction, f"You have already finished this round, your podium position is: #{podium_position}")
                 return
 
-        content, embed = format_tile_message(interaction.user, tile_data)
-        await interaction.response.send_message(content, embed=embed)
+        content, embed = format_tile_message(interaction.user, get_templates(board_data).get(current_tile))
+        await respond(interaction, content, embed=embed)
 
 # /checkrolls
-@bot.tree.command(name="checkrolls", description="Check how many rolls and when cooldown ends")
-async def checkrolls(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+@snl_command(name="checkrolls", description="Check how many rolls and when cooldown ends", ephemeral=True)
+@app_commands.describe(board="Board to check (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def checkrolls(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
     
-    user_id = str(interaction.user.id)
-    guild_id = str(interaction.guild.id)
-
-    data.setdefault("rolls", {}).setdefault(guild_id, {}).setdefault(user_id, 0)
+    player = game.get(interaction.user.id)
+    rolls_left = player.rolls if player else game.start_rolls
 
     # Get the time delta until the next midnight in Melbourne time
     delta = next_midnight_melbourne()
@@ -382,229 +591,310 @@ async def checkrolls(interaction: discord.Interaction):
     next_grant_str = next_time.strftime("%I:%M %p").lstrip("0")
 
     # Send the message with the current number of rolls and next grant time
-    await interaction.response.send_message(
-        f"You have {data['rolls'][guild_id][user_id]} roll(s) left. "
+    await respond(interaction,
+        f"You have {rolls_left} roll(s) left. "
         f"⏭️ Next auto-grant: {str(delta).split('.')[0]}.",
         ephemeral=True
     )
 
 
 # /submit
-@bot.tree.command(name="submit", description="Submit your tile (image required)")
-@app_commands.describe(image="Upload an image with your submission")
-async def submit(interaction: discord.Interaction, image: Attachment):
-    if interaction.channel.name != SNL_COMMANDS_CHANNEL:
-        await interaction.response.send_message(f"You can only use this command in #{SNL_COMMANDS_CHANNEL}.", ephemeral=True)
+@snl_command(name="submit", description="Submit your tile (image required)", defer=True, ephemeral=True)
+@app_commands.describe(image="Upload an image with your submission", board="Board the tile is on (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def submit(interaction: discord.Interaction, image: Attachment, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
 
     if not image:
-        await interaction.response.send_message("You must attach an image with your submission!", ephemeral=True)
+        await respond(interaction, "You must attach an image with your submission!", ephemeral=True)
         return
 
-    await interaction.response.defer(ephemeral=True)
+    # Get the snl-submissions channel
+    submissions_channel = discord.utils.get(interaction.guild.text_channels, name=SUBMISSION_CHANNEL)
+    if not submissions_channel:
+        await respond(interaction, f"Submission channel #{SUBMISSION_CHANNEL} not found!", ephemeral=True)
+        return
 
-    user_id = str(interaction.user.id)
-    guild_id = str(interaction.guild.id)
+    # Stream the attachment and build a compressed preview (or reuse the CDN link)
+    try:
+        file, image_url = await prepare_submission(image)
+    except SubmissionRejected as e:
+        await respond(interaction, str(e), ephemeral=True)
+        return
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Failed to download submission from {interaction.user}: {e}")
+        await respond(interaction, "Couldn't download your image, please try again.", ephemeral=True)
+        return
+
+    board_data = await fetch_board(game.board)
+    if board_data is None:
+        await respond(interaction, f"The board `{game.board}` is no longer available.", ephemeral=True)
+        return
+
+    guild_id = interaction.guild.id
+    player = game.player(interaction.user.id)
+    generation = game.generation  # A /reset while this runs makes the submission stale
 
     # Set approval to pending
-    data.setdefault("approvals", {}).setdefault(guild_id, {})[user_id] = False
-    save_data()
+    player.approved = False
+    save_data(game)
+    exporter.player_changed(game, player)
 
-    # Get user tile position, default to 1 if missing
-    tile_number = data.get("positions", {}).get(guild_id, {}).get(user_id, 1)
-    tile_data = get_tile_data(tile_number)
+    tile_data = board_data["tiles"].get(player.position)
 
     # Prepare submission message text
     if tile_data:
-        tile_num = tile_data.get("Tile", tile_number)
-        task = tile_data.get("Task", "Unknown Task")
-        target = tile_data.get("Target", "Unknown Target")
-        drop_rate = tile_data.get("Drop Rate", "Unknown Drop Rate")
-        submission_message = (
-            f"**{interaction.user.display_name}** has submitted **Tile {tile_num}**, "
-            f"**{task}** from **{target}** ({drop_rate})."
-        )
+        tile_num = tile_data["Tile"]
+        task = tile_data["Task"]
+        target = tile_data["Target"]
+        drop_rate = tile_data["Drop Rate"]
+        submission_message = f"**{interaction.user.display_name}** has submitted {get_templates(board_data)[tile_num].summary}{board_label(game)}."
     else:
         submission_message = f"{interaction.user.display_name} has submitted their task."
 
-    # Get the snl-submissions channel
-    submissions_channel = discord.utils.get(interaction.guild.text_channels, name=SUBMISSION_CHANNEL)
-    if not submissions_channel:
-        await interaction.followup.send(f"Submission channel #{SUBMISSION_CHANNEL} not found!", ephemeral=True)
-        return
-
     # Send the submission image message in snl-submissions channel
-    msg = await submissions_channel.send(
-        submission_message,
-        file=await image.to_file()
-    )
+    if image_url:
+        embed = discord.Embed(color=discord.Color.blue())
+        embed.set_image(url=image_url)
+        msg = await submissions_channel.send(submission_message, embed=embed)
+    else:
+        msg = await submissions_channel.send(submission_message, file=file)
     await msg.add_reaction("✅")
 
+    # A new submission for a tile that already has one waiting means the last attempt wasn't accepted
+    previous = pending_submissions.get((guild_id, player.user_id, game.board))
+    if previous is not None and previous["tile"] is not None and previous["tile"] == (tile_num if tile_data else None):
+        game.stats.record_failure(previous["tile"])
+        save_data(game)
+
     # Store the submission info so approval links to this exact message
-    pending_submissions[(int(guild_id), int(user_id))] = {
+    pending_submissions[(guild_id, player.user_id, game.board)] = {
         "tile": tile_num if tile_data else None,
         "task": task if tile_data else None,
         "target": target if tile_data else None,
         "drop_rate": drop_rate if tile_data else None,
         "message_id": msg.id,
-        "channel_id": msg.channel.id
+        "channel_id": msg.channel.id,
+        "submitted_at": time.time(),
+        "generation": generation
     }
 
     # Send ephemeral confirmation to user
-    await interaction.followup.send("Submission received! A host will approve it shortly.", ephemeral=True)
+    await respond(interaction, "Submission received! A host will approve it shortly.", ephemeral=True)
 
     # Post outstanding approvals to #snl-admin
     admin_channel = discord.utils.get(interaction.guild.text_channels, name=ADMIN_CHANNEL)
     if admin_channel:
-        pending = data["approvals"].get(guild_id, {})
-        user_submissions = {}
-
-        # Only include users with pending approval who have a stored submission message
-        for (g_id, u_id), info in pending_submissions.items():
-            if str(g_id) == guild_id and pending.get(str(u_id)) is False:
-                user = interaction.guild.get_member(u_id)
-                if user:
-                    jump_url = f"https://discord.com/channels/{guild_id}/{info['channel_id']}/{info['message_id']}"
-                    user_submissions[u_id] = (user, jump_url, info)
-
-        if user_submissions:
-            embed = discord.Embed(
-                title="🕓 Outstanding Approvals",
-                description="\n".join(
-                    f"🔸 {user.mention} — Tile {info['tile']}, {info['task']} from {info['target']} ({info['drop_rate']}) — [Jump to Submission]({url})"
-                    for _, (user, url, info) in user_submissions.items()
-                ),
-                color=discord.Color.orange()
-            )
+        embed = outstanding_approvals_embed(interaction.guild, "🕓 Outstanding Approvals")
+        if embed:
             await admin_channel.send(embed=embed)
 
 # /addroll
-@bot.tree.command(name="addroll", description="Add roll(s) to a player (SNL Host Only)")
-@app_commands.describe(user="Player to add rolls to", amount="Number of rolls")
-async def addroll(interaction: discord.Interaction, user: discord.Member, amount: int):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+@snl_command(name="addroll", description="Add roll(s) to a player (SNL Host Only)", host_only=True)
+@app_commands.describe(user="Player to add rolls to", amount="Number of rolls", board="Board the player is on (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def addroll(interaction: discord.Interaction, user: discord.Member, amount: int, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
+    player = game.player(user.id)
+    player.rolls += amount
+    save_data(game)
+    exporter.player_changed(game, player)
+    history.record(game.guild_id, user.id, "addroll", board=game.board, amount=amount, by=str(interaction.user.id))
 
-    if not can_use_command(interaction, SNL_HOST_ROLE):
-        await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
-        return
-
-    user_id = str(user.id)
-    guild_id = str(interaction.guild.id)
+    await respond(interaction, f"{amount} roll(s) added to {user.mention}{board_label(game)}.")
 
-    data.setdefault("rolls", {}).setdefault(guild_id, {}).setdefault(user_id, 0)
-    data["rolls"][guild_id][user_id] += amount
-    save_data()
+# /removeroll
+@snl_command(name="removeroll", description="Remove roll(s) from a player (SNL Host Only)", host_only=True)
+@app_commands.describe(user="Player to remove rolls from", amount="Number of rolls", board="Board the player is on (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def removeroll(interaction: discord.Interaction, user: discord.Member, amount: int, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
+        return
+    player = game.player(user.id)
+    player.rolls = max(0, player.rolls - amount)
+    save_data(game)
+    exporter.player_changed(game, player)
+    history.record(game.guild_id, user.id, "removeroll", board=game.board, amount=amount, by=str(interaction.user.id))
 
-    await interaction.response.send_message(f"{amount} roll(s) added to {user.mention}.")
+    await respond(interaction, f"{amount} roll(s) removed from {user.mention}{board_label(game)}.")
 
-# /removeroll
-@bot.tree.command(name="removeroll", description="Remove roll(s) from a player (SNL Host Only)")
-@app_commands.describe(user="Player to remove rolls from", amount="Number of rolls")
-async def removeroll(interaction: discord.Interaction, user: discord.Member, amount: int):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+# /setpos
+@snl_command(name="setpos", description="Change user's tile position (SNL Host Only)", host_only=True)
+@app_commands.describe(user="Player to move", tile="New tile number", board="Board the player is on (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def setpos(interaction: discord.Interaction, user: discord.Member, tile: int, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
+        return
+    player = game.player(user.id)
+    old_tile = player.position
+    game.move(player, tile)
+    save_data(game)
+    exporter.player_changed(game, player)
+    history.record(game.guild_id, user.id, "setpos", board=game.board, by=str(interaction.user.id), **{"from": old_tile, "to": tile})
+
+    await respond(interaction, f"{user.mention} has been moved from Tile {old_tile} to Tile {tile}{board_label(game)} by {interaction.user.mention}.")
+
+# /history
+@snl_command(name="history", description="Show recent rolls, snakes, ladders and approvals", ephemeral=True)
+@app_commands.describe(user="Player to look up (SNL Host Only for other players)", count="Number of events to show")
+async def history_command(interaction: discord.Interaction, user: discord.Member = None, count: int = HISTORY_DEFAULT_COUNT):
+    target = user or interaction.user
+    if target.id != interaction.user.id and not can_use_command(interaction, SNL_HOST_ROLE):
+        await respond(interaction, "You do not have permission to view other players' history.", ephemeral=True)
         return
 
-    if not can_use_command(interaction, SNL_HOST_ROLE):
-        await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+    count = max(1, min(count, HISTORY_MAX_COUNT))
+    events = history.last(interaction.guild.id, target.id, count)
+    if not events:
+        await respond(interaction, f"No history recorded for {target.mention} yet.", ephemeral=True)
         return
 
-    user_id = str(user.id)
-    guild_id = str(interaction.guild.id)
+    embed = discord.Embed(
+        title=f"📜 Recent history for {target.display_name}",
+        description="\n".join(format_history_event(event) for event in events),
+        color=discord.Color.blue()
+    )
+    await respond(interaction, embed=embed, ephemeral=True)
+
+# /stats
+@snl_command(name="stats", description="Show statistics for the current game")
+@app_commands.describe(board="Board to show (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def stats(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
+        return
+    game_stats = game.stats
 
-    data.setdefault("rolls", {}).setdefault(guild_id, {}).setdefault(user_id, 0)
-    data["rolls"][guild_id][user_id] = max(0, data["rolls"][guild_id][user_id] - amount)
-    save_data()
+    if game_stats.approvals:
+        turnaround = str(timedelta(seconds=int(game_stats.average_approval_seconds)))
+    else:
+        turnaround = "n/a"
 
-    await interaction.response.send_message(f"{amount} roll(s) removed from {user.mention}.")
+    if game_stats.top_failed:
+        failed = "\n".join(f"Tile {tile} — {count} resubmission(s)" for count, tile in game_stats.top_failed)
+    else:
+        failed = "*None yet*"
+
+    embed = discord.Embed(title=f"📊 Game Statistics{'' if game.board == DEFAULT_BOARD else f' — {game.board}'}", color=discord.Color.blue())
+    embed.add_field(name="🎲 Rolls", value=str(game_stats.rolls), inline=True)
+    embed.add_field(name="🐍 Snakes Hit", value=str(game_stats.snakes), inline=True)
+    embed.add_field(name="🪜 Ladders Climbed", value=str(game_stats.ladders), inline=True)
+    embed.add_field(name="👥 Avg Rolls / Player", value=f"{game_stats.average_rolls:.1f}", inline=True)
+    embed.add_field(name="⏱️ Avg Approval Time", value=turnaround, inline=True)
+    embed.add_field(name="❌ Most-Failed Tiles", value=failed, inline=False)
+
+    await respond(interaction, embed=embed)
+
+# /approve
+@snl_command(name="approve", description="Approve several submissions at once (SNL Host Only)", host_only=True, defer=True, ephemeral=True)
+@app_commands.describe(players="Players to approve (mention them), or \"all\" for every pending submission", board="Only approve submissions on this board")
+@app_commands.autocomplete(board=board_autocomplete)
+async def approve(interaction: discord.Interaction, players: str, board: str = None):
+    board_name = None
+    if board:
+        game = await open_game(interaction, board)
+        if game is None:
+            return
+        board_name = game.board
 
-# /setpos
-@bot.tree.command(name="setpos", description="Change user's tile position (SNL Host Only)")
-@app_commands.describe(user="Player to move", tile="New tile number")
-async def setpos(interaction: discord.Interaction, user: discord.Member, tile: int):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+    approve_all = players.strip().lower() in ("all", "all pending")
+    # Mentions (<@id>) or bare Discord IDs; replayed traces mention shorter pseudonymous IDs
+    user_ids = {int(mention or bare) for mention, bare in re.findall(r"<@!?(\d+)>|\b(\d{15,20})\b", players)}
+    if not approve_all and not user_ids:
+        await respond(interaction, "Mention the players to approve, or use `all` for every pending submission.", ephemeral=True)
         return
 
-    if not can_use_command(interaction, SNL_HOST_ROLE):
-        await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+    guild = interaction.guild
+    keys = [
+        (g_id, u_id, b) for (g_id, u_id, b) in pending_submissions
+        if g_id == guild.id and (board_name is None or b == board_name) and (approve_all or u_id in user_ids)
+    ]
+
+    # Apply every approval in memory first, then write each touched game once
+    approved, touched = [], {}
+    for g_id, u_id, b in keys:
+        game = apply_approval(g_id, u_id, b, interaction.user.id)
+        if game is not None:
+            approved.append((u_id, game))
+            touched[(g_id, b)] = game
+    for game in touched.values():
+        save_data(game)
+
+    if not approved:
+        await respond(interaction, "There were no pending submissions to approve.", ephemeral=True)
         return
 
-    user_id = str(user.id)
-    guild_id = str(interaction.guild.id)
-
-    data.setdefault("positions", {}).setdefault(guild_id, {}).setdefault(user_id, 1)
-    old_tile = data["positions"][guild_id][user_id]
-    data["positions"][guild_id][user_id] = tile
-    save_data()
+    # One consolidated announcement
+    ready = [f"<@{u_id}>{board_label(game)}" for u_id, game in approved if game.get(u_id).rolls > 0]
+    waiting = [f"<@{u_id}>{board_label(game)}" for u_id, game in approved if game.get(u_id).rolls <= 0]
+    lines = [f"✅ {interaction.user.mention} approved {len(approved)} submission(s)."]
+    if ready:
+        lines.append(f"Free to roll again: {', '.join(ready)}")
+    if waiting:
+        lines.append(f"Next roll in `{time_until_midnight()}`: {', '.join(waiting)}")
+    chat_channel = discord.utils.get(guild.text_channels, name=SUBMISSION_CHANNEL)
+    if chat_channel:
+        await chat_channel.send("\n".join(lines))
 
-    await interaction.response.send_message(f"{user.mention} has been moved from Tile {old_tile} to Tile {tile} by {interaction.user.mention}.")
+    await post_admin_update(guild)
+    await respond(interaction, f"Approved {len(approved)} submission(s).", ephemeral=True)
 
 # /board
-@bot.tree.command(name="board", description="View the board")
-async def board(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+@snl_command(name="board", description="View the board")
+@app_commands.describe(board="Board to show (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def board(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
-    if os.path.exists("board.jpg"):
-        await interaction.response.send_message(file=discord.File("board.jpg"))
+
+    # The main board's image is board.jpg, other boards use boards/<name>.jpg
+    image_path = "board.jpg" if game.board == DEFAULT_BOARD else os.path.join("boards", f"{game.board}.jpg")
+    if os.path.exists(image_path):
+        await respond(interaction, file=discord.File(image_path))
     else:
-        await interaction.response.send_message("Board image not found.", ephemeral=True)
+        await respond(interaction, "Board image not found.", ephemeral=True)
 
 
 # /leaderboard
-@bot.tree.command(name="leaderboard", description="Display the leaderboard")
-async def leaderboard(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+@snl_command(name="leaderboard", description="Display the leaderboard", defer=True)
+@app_commands.describe(board="Board to show (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def leaderboard(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
+    board_data = await fetch_board(game.board)
+    if board_data is None:
+        await respond(interaction, f"The board `{game.board}` is no longer available.")
+        return
+    templates = get_templates(board_data)
 
-    await interaction.response.defer()  # ✅ Minimal fix — prevents Unknown interaction error
-
-    guild_id = str(interaction.guild.id)
-    data.setdefault("positions", {}).setdefault(guild_id, {})
-    data.setdefault("rolls", {}).setdefault(guild_id, {})
-
+    # Players come out of the ranking index already sorted by tile descending (highest first)
     rows = []
-    for user_id, tile in data["positions"][guild_id].items():
+    for player in game.ranked():
+        tile = player.position
         if tile == 0:  # Skip players at tile 0
             continue
-        user = interaction.guild.get_member(int(user_id))
+        user = interaction.guild.get_member(player.user_id)
         if not user:
             continue
-        tile_data = get_tile_data(tile)
-        if tile_data is None:
+        template = templates.get(tile)
+        if template is None:
             continue
-        rolls_left = data["rolls"][guild_id].get(user_id, 0)
-        rows.append((tile, user.display_name, tile_data["Target"], tile_data["Task"], rolls_left))
-
-    # Sort by tile descending (highest first)
-    rows.sort(key=lambda x: x[0], reverse=True)
+        # Target and Task come pre-truncated from the tile template
+        rows.append((tile, user.display_name, template.short_target, template.short_task, player.rolls))
 
     # Build leaderboard lines with emojis and plain text
     lines = []
     for idx, (tile, name, target, task, rolls_left) in enumerate(rows, start=1):
-        # Truncate long text
-        target = (target[:20] + "...") if len(target) > 23 else target
-        task = (task[:30] + "...") if len(task) > 33 else task
-
         # Emoji for position
         if idx == 1:
             position_emoji = "🥇"
@@ -625,78 +915,66 @@ async def leaderboard(interaction: discord.Interaction):
         lines.append(line)
 
     embed = discord.Embed(
-        title="🎲 Snakes and Ladders Leaderboard",
+        title=f"🎲 Snakes and Ladders Leaderboard{'' if game.board == DEFAULT_BOARD else f' — {game.board}'}",
         description="\n".join(lines) if lines else "*No players on the board yet.*",
         color=discord.Color.gold()
     )
 
-    await interaction.followup.send(embed=embed)  # ✅ Use followup after deferring
+    await respond(interaction, embed=embed)
 
 
 
 
 
 # /podium
-@bot.tree.command(name="podium", description="Show users who finished the board")
-async def podium(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
+@snl_command(name="podium", description="Show users who finished the board")
+@app_commands.describe(board="Board to show (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def podium(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
-    guild_id = str(interaction.guild.id)
-    data.setdefault("podium", {}).setdefault(guild_id, [])
 
-    if not data["podium"][guild_id]:
-        await interaction.response.send_message("No players have reached the end yet.")
+    if not game.podium:
+        await respond(interaction, "No players have reached the end yet.")
         return
 
     message = "**🏆 Podium Placements 🏆**\n"
-    for i, user_id in enumerate(data["podium"][guild_id], start=1):
-        user = interaction.guild.get_member(int(user_id))
+    for i, user_id in enumerate(game.podium, start=1):
+        user = interaction.guild.get_member(user_id)
         name = user.mention if user else f"<@{user_id}>"
         message += f"{i}. {name}\n"
 
-    await interaction.response.send_message(message)
+    await respond(interaction, message)
 
 # /reset
-@bot.tree.command(name="reset", description="Reset game (SNL Host Only)")
-async def reset(interaction: discord.Interaction):
-    if not is_snl_commands_channel(interaction):
-        await interaction.response.send_message(
-            f"You can only use this command in the #{SNL_COMMANDS_CHANNEL} channel.",
-            ephemeral=True
-        )
-        return
-
-    if not can_use_command(interaction, SNL_HOST_ROLE):
-        await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+@snl_command(name="reset", description="Reset game (SNL Host Only)", host_only=True, ephemeral=True)
+@app_commands.describe(board="Board to reset (defaults to the main board)")
+@app_commands.autocomplete(board=board_autocomplete)
+async def reset(interaction: discord.Interaction, board: str = None):
+    game = await open_game(interaction, board)
+    if game is None:
         return
 
-    guild_id = str(interaction.guild.id)
-
     async def confirm_reset(interaction_to_use):
-        # Reset data
-        data["positions"][guild_id] = {}
-        data["rolls"][guild_id] = {}
-        data["approvals"][guild_id] = {}
-        data["podium"][guild_id] = []
-
-        for member in interaction_to_use.guild.members:
-            if not member.bot:
-                user_id = str(member.id)
-                data["positions"][guild_id][user_id] = 0  # start on Tile 0
-                data["rolls"][guild_id][user_id] = 1
-                data["approvals"][guild_id][user_id] = True
-
-        save_data()
+        # Start a new generation; players join it on Tile 0 with 1 roll when they next play
+        finished = game.reset()
+        save_data(game)
+        # Submissions from the finished game can no longer be approved
+        for key in [key for key in pending_submissions if key[0] == game.guild_id and key[2] == game.board]:
+            del pending_submissions[key]
+        exporter.game_reset(game)
+
+        try:
+            await asyncio.to_thread(data.archive, finished)
+        except OSError as e:
+            print(f"Failed to archive the previous game for guild {game.guild_id}: {e}")
 
         # Send message tagging SNL role in #snl-chat
         snl_role = discord.utils.get(interaction_to_use.guild.roles, name=SNL_ROLE)
         snl_chat_channel = discord.utils.get(interaction_to_use.guild.text_channels, name="snl-chat")
         if snl_role and snl_chat_channel:
-            await snl_chat_channel.send(f"{snl_role.mention}, the game has been reset!")
+            await snl_chat_channel.send(f"{snl_role.mention}, the game{board_label(game)} has been reset!")
 
         await interaction_to_use.followup.send("Game has been reset. Everyone is back to Tile 0 with 1 roll.", ephemeral=True)
 
@@ -707,79 +985,47 @@ async def reset(interaction: discord.Interaction):
             super().__init__(style=discord.ButtonStyle.danger, label="Reset Game")
 
         async def callback(self, interaction2: discord.Interaction):
-            await interaction2.response.defer()
+            # Only the first click resets; stop the view before any await so a double click can't reset twice
+            if view.is_finished():
+                return
+            view.stop()
+            self.disabled = True
+            await interaction2.response.edit_message(view=view)
             await confirm_reset(interaction2)
 
     view.add_item(Confirm())
 
-    await interaction.response.send_message(
+    await respond(interaction,
         "Are you sure you want to reset the game and everyone’s progress?",
         view=view,
         ephemeral=True
     )
 
-# ✅ Reaction handler for submission approval
+# Background work that needs the event loop
 @bot.event
-async def on_raw_reaction_add(payload):
-    if str(payload.emoji) != "✅":
-        return
-
-    guild = bot.get_guild(payload.guild_id)
-    if guild is None:
-        return
+async def setup_hook():
+    exporter.start()
 
-    member = guild.get_member(payload.user_id)
-    if member is None or not any(role.name == SNL_HOST_ROLE for role in member.roles):
-        return
-
-    channel = guild.get_channel(payload.channel_id)
-    if channel is None or channel.name != SUBMISSION_CHANNEL:
-        return
-
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except discord.NotFound:
-        return
-
-    if not message.attachments or len(message.mentions) != 1:
-        return
-
-    user = message.mentions[0]
-    guild_id = str(guild.id)
-    user_id = str(user.id)
-
-    if data["approvals"].get(guild_id, {}).get(user_id) is not False:
-        return  # Already approved
-
-    # Mark as approved
-    data["approvals"][guild_id][user_id] = True
-    save_data()
-
-    # Check if they can roll now
-    rolls = data["rolls"].get(guild_id, {}).get(user_id, 0)
-    can_roll = rolls > 0
-
-    # Calculate next roll time
-    now = datetime.now(pytz.timezone("Australia/Melbourne"))
-    next_reset = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-    time_until_reset = next_reset - now
-    formatted_time = str(time_until_reset).split(".")[0]  # Remove microseconds
-
-    # Compose message
-    if can_roll:
-        msg = f"{user.mention}'s submission has been approved by {member.mention}. You are now free to roll again."
-    else:
-        msg = f"{user.mention}'s submission has been approved by {member.mention}. You need to wait `{formatted_time}` until you can roll again."
-
-    # Post to snl-chat
-    chat_channel = discord.utils.get(guild.text_channels, name=SUBMISSION_CHANNEL)
-    if chat_channel:
-        await chat_channel.send(msg)
+# Traffic capture (only when SNL_TRACE_FILE is set)
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if trace_recorder:
+        trace_recorder.interaction(interaction)
 
 # Reactions
 
 @bot.event
 async def on_raw_reaction_add(payload):
+    if trace_recorder:
+        submitter_id, submitter_board = next(
+            ((u_id, b) for (g_id, u_id, b), info in pending_submissions.items()
+             if g_id == payload.guild_id and info["message_id"] == payload.message_id),
+            (None, None)
+        )
+        traced_guild = bot.get_guild(payload.guild_id)
+        traced_channel = traced_guild.get_channel(payload.channel_id) if traced_guild else None
+        trace_recorder.reaction(payload, traced_channel, payload.member, submitter_id, submitter_board)
+
     if str(payload.emoji) != "✅":
         return
 
@@ -795,83 +1041,36 @@ async def on_raw_reaction_add(payload):
     if channel is None or channel.name != SUBMISSION_CHANNEL:
         return
 
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except discord.NotFound:
-        return
-
     # Find which user this submission belongs to by matching message ID in pending_submissions
-    approved_user_id = None
-    for (g_id, u_id), info in pending_submissions.items():
-        if g_id == guild.id and info["message_id"] == message.id:
-            approved_user_id = u_id
-            break
-
-    if approved_user_id is None:
+    key = next(
+        (key for key, info in pending_submissions.items()
+         if key[0] == guild.id and info["message_id"] == payload.message_id),
+        None
+    )
+    if key is None:
         return
 
-    guild_id = str(guild.id)
-    user_id = str(approved_user_id)
-
-    if data["approvals"].get(guild_id, {}).get(user_id) is not False:
+    _, approved_user_id, board_name = key
+    game = apply_approval(guild.id, approved_user_id, board_name, member.id)
+    if game is None:
         return  # Already approved
-
-    # Mark as approved
-    data["approvals"][guild_id][user_id] = True
-    save_data()
-
-    # Remove from pending_submissions since approved
-    pending_submissions.pop((guild.id, approved_user_id), None)
-
-    # Check if they can roll now
-    rolls = data["rolls"].get(guild_id, {}).get(user_id, 0)
-    can_roll = rolls > 0
-
-    # Calculate next roll time
-    now = datetime.now(pytz.timezone("Australia/Melbourne"))
-    next_reset = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-    time_until_reset = next_reset - now
-    formatted_time = str(time_until_reset).split(".")[0]  # Remove microseconds
+    save_data(game)
+    player = game.get(approved_user_id)
 
     # Compose message
-    if can_roll:
-        msg = f"<@{user_id}>'s submission has been approved by {member.mention}. You are now free to roll again."
+    if player.rolls > 0:
+        msg = f"<@{approved_user_id}>'s submission{board_label(game)} has been approved by {member.mention}. You are now free to roll again."
     else:
-        msg = f"<@{user_id}>'s submission has been approved by {member.mention}. You need to wait `{formatted_time}` until you can roll again."
+        msg = f"<@{approved_user_id}>'s submission{board_label(game)} has been approved by {member.mention}. You need to wait `{time_until_midnight()}` until you can roll again."
 
     # Post to snl-submissions
     chat_channel = discord.utils.get(guild.text_channels, name=SUBMISSION_CHANNEL)
     if chat_channel:
         await chat_channel.send(msg)
 
-    # Send updated outstanding approvals embed to snl-admin
-    admin_channel = discord.utils.get(guild.text_channels, name=ADMIN_CHANNEL)
-    if admin_channel:
-        pending = data["approvals"].get(guild_id, {})
-        user_submissions = {}
-
-        for (g_id, u_id), info in pending_submissions.items():
-            if str(g_id) == guild_id and pending.get(str(u_id)) is False:
-                user = guild.get_member(u_id)
-                if user:
-                    jump_url = f"https://discord.com/channels/{guild_id}/{info['channel_id']}/{info['message_id']}"
-                    user_submissions[u_id] = (user, jump_url, info)
+    await post_admin_update(guild)
 
-        if user_submissions:
-            embed = discord.Embed(
-                title="📋 Updated Outstanding Approvals",
-                description="\n".join(
-                    f"🔸 {user.mention} — Tile {info['tile']}, {info['task']} from {info['target']} ({info['drop_rate']}) — [Jump to Submission]({url})"
-                    for _, (user, url, info) in user_submissions.items()
-                ),
-                color=discord.Color.orange()
-            )
-        else:
-            embed = discord.Embed(
-                title="✅ All submissions have been approved!",
-                color=discord.Color.green()
-            )
-        await admin_channel.send(embed=embed)
 # Start the bot
-bot.run(os.getenv("DISCORD_TOKEN"))
+if __name__ == "__main__":
+    bot.run(os.getenv("DISCORD_TOKEN"))
 
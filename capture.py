@@ -0,0 +1,115 @@
+# capture.py
+
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+
+import discord
+
+# --- CONFIGURATION ---
+# Set SNL_TRACE_FILE to record every interaction and reaction to that file (JSON lines).
+TRACE_FILE = os.getenv("SNL_TRACE_FILE")
+# IDs are replaced with a keyed hash. Keep the salt fixed to make IDs line up across restarts.
+TRACE_SALT = os.getenv("SNL_TRACE_SALT") or os.urandom(16).hex()
+TRACED_CHANNELS = {"snl-commands", "snl-submissions", "snl-admin", "snl-chat"}
+TRACED_ROLES = {"SNL", "SNL Host"}
+
+# Discord option types that carry a snowflake
+USER_OPTION_TYPES = {6, 9}  # USER, MENTIONABLE
+ATTACHMENT_OPTION_TYPE = 11
+STRING_OPTION_TYPE = 3
+SNOWFLAKE_PATTERN = re.compile(r"\d{15,20}")  # Discord IDs typed or mentioned in free text
+
+
+def anon(snowflake) -> int:
+    """Maps a Discord ID to a stable 48-bit pseudonym for this salt."""
+    if snowflake is None:
+        return None
+    digest = hmac.new(TRACE_SALT.encode(), str(snowflake).encode(), hashlib.sha256).hexdigest()
+    return int(digest[:12], 16)
+
+
+def _channel_name(channel) -> str:
+    name = getattr(channel, "name", None)
+    return name if name in TRACED_CHANNELS else "other"
+
+
+def _roles(member) -> list:
+    return sorted(role.name for role in getattr(member, "roles", []) if role.name in TRACED_ROLES)
+
+
+def _options(interaction: discord.Interaction) -> dict:
+    """
+    Flattens slash command options, pseudonymising users (including IDs and mentions inside
+    string options) and keeping only attachment metadata.
+    """
+    raw = interaction.data or {}
+    resolved = raw.get("resolved", {})
+    options = {}
+    for option in raw.get("options", []):
+        kind, value = option.get("type"), option.get("value")
+        if kind in USER_OPTION_TYPES:
+            roles = []
+            member = interaction.guild.get_member(int(value)) if interaction.guild else None
+            if member:
+                roles = _roles(member)
+            options[option["name"]] = {"user": anon(value), "roles": roles}
+        elif kind == ATTACHMENT_OPTION_TYPE:
+            attachment = resolved.get("attachments", {}).get(str(value), {})
+            options[option["name"]] = {"attachment": {"size": attachment.get("size", 0), "content_type": attachment.get("content_type")}}
+        elif kind == STRING_OPTION_TYPE and isinstance(value, str):
+            options[option["name"]] = SNOWFLAKE_PATTERN.sub(lambda m: str(anon(m.group())), value)
+        else:
+            options[option["name"]] = value
+    return options
+
+
+class TraceRecorder:
+    """Appends an anonymised record of incoming interactions and reactions to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+
+    def _write(self, event: dict):
+        event["t"] = round(time.time(), 3)
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def interaction(self, interaction: discord.Interaction):
+        if interaction.type == discord.InteractionType.application_command:
+            self._write({
+                "type": "command",
+                "command": (interaction.data or {}).get("name"),
+                "guild": anon(interaction.guild_id),
+                "user": anon(interaction.user.id),
+                "roles": _roles(interaction.user),
+                "channel": _channel_name(interaction.channel),
+                "options": _options(interaction),
+            })
+        elif interaction.type == discord.InteractionType.component:
+            self._write({
+                "type": "component",
+                "guild": anon(interaction.guild_id),
+                "user": anon(interaction.user.id),
+                "roles": _roles(interaction.user),
+                "channel": _channel_name(interaction.channel),
+            })
+
+    def reaction(self, payload: discord.RawReactionActionEvent, channel, member, submitter_id: int = None, board: str = None):
+        """`submitter_id` and `board` identify the pending submission the message belongs to, if any."""
+        self._write({
+            "type": "reaction",
+            "emoji": str(payload.emoji),
+            "guild": anon(payload.guild_id),
+            "user": anon(payload.user_id),
+            "roles": _roles(member) if member else [],
+            "channel": _channel_name(channel),
+            "submitter": anon(submitter_id),
+            "board": board,
+        })
+
+
+recorder = TraceRecorder(TRACE_FILE) if TRACE_FILE else None
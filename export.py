@@ -0,0 +1,188 @@
+# export.py
+"""
+Pushes game state changes to the Apps Script web app that feeds the spreadsheet dashboards.
+
+Changes are queued per (guild, board, player), so several updates to one player between
+flushes collapse into one. Every update carries the game's generation, and a /reset queues a
+reset marker, so the web app can ignore anything left over from a previous game. A background task sends them in batched POSTs over the shared
+HTTP session, retrying with backoff. Commands only ever touch the in-memory queue.
+
+To try it against a local stand-in instead of the real web app:
+
+    python export.py serve 8080
+    SNL_EXPORT_URL=http://127.0.0.1:8080/ python bot.py
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+
+import aiohttp
+
+from webclient import get_session
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# --- CONFIGURATION ---
+BATCH_SIZE = 100       # Players per POST
+FLUSH_INTERVAL = 5.0   # Seconds between flushes while changes are waiting
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0     # First retry delay in seconds, doubled each attempt
+BACKOFF_CAP = 60.0
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class ExportError(Exception):
+    """A batch the web app rejected outright; retrying won't help."""
+
+
+class Exporter:
+    def __init__(self, url: str):
+        self.url = url
+        self._pending = {}  # {(guild_id, board, user_id or None for a reset): snapshot}, in first-changed order
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def player_changed(self, game, player):
+        """Queues the player's current state. Cheap enough to call from any command."""
+        if not self.enabled:
+            return
+        self._pending[(game.guild_id, game.board, player.user_id)] = {
+            "guild": str(game.guild_id),
+            "board": game.board,
+            "generation": game.generation,
+            "user": str(player.user_id),
+            "position": player.position,
+            "rolls": player.rolls,
+            "approved": player.approved,
+            "podium": game.podium_place(player.user_id),
+            "ts": int(time.time()),
+        }
+        if len(self._pending) >= BATCH_SIZE:
+            self._wakeup.set()
+
+    def game_reset(self, game):
+        """Queues a reset marker for the game, replacing any of its player updates still waiting."""
+        if not self.enabled:
+            return
+        for key in [key for key in self._pending if key[:2] == (game.guild_id, game.board)]:
+            del self._pending[key]
+        self._pending[(game.guild_id, game.board, None)] = {
+            "guild": str(game.guild_id),
+            "board": game.board,
+            "generation": game.generation,
+            "reset": True,
+            "ts": int(time.time()),
+        }
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stops the background task and makes a final attempt to send anything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        while self._pending:
+            if not await self._flush_batch():
+                break
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._pending:
+                if not await self._flush_batch():
+                    break
+
+    def _take_batch(self) -> dict:
+        batch = {}
+        for key in list(self._pending)[:BATCH_SIZE]:
+            batch[key] = self._pending.pop(key)
+        return batch
+
+    def _requeue(self, batch: dict):
+        """
+        Puts an unsent batch back at the front of the queue, since it is older than anything
+        queued meanwhile. Entries superseded by a newer snapshot or by a later reset are dropped.
+        """
+        requeued = {}
+        for key, snapshot in batch.items():
+            if key in self._pending:
+                continue
+            reset = self._pending.get(key[:2] + (None,))
+            if reset is not None and snapshot["generation"] < reset["generation"]:
+                continue
+            requeued[key] = snapshot
+        self._pending = {**requeued, **self._pending}
+
+    async def _flush_batch(self) -> bool:
+        batch = self._take_batch()
+        try:
+            await self._post(list(batch.values()))
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except ExportError as e:
+            logger.error(f"Export batch of {len(batch)} dropped: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Export failed after {MAX_RETRIES} retries, will try again later: {e}")
+            self._requeue(batch)
+            return False
+        return True
+
+    async def _post(self, updates: list):
+        body = {"type": "snl_state", "updates": updates}
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with get_session().post(self.url, json=body) as resp:
+                    if resp.status < 300:
+                        return
+                    if resp.status not in RETRY_STATUSES:
+                        raise ExportError(f"HTTP {resp.status}: {(await resp.text())[:200]}")
+                    retry_after = resp.headers.get("Retry-After")
+                    error = aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retry_after, error = None, e
+
+            if attempt == MAX_RETRIES:
+                raise error
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+
+
+# --- LOCAL STAND-IN ---
+def serve(port: int):
+    """Runs a local HTTP stand-in for the web app that prints each batch it receives."""
+    from aiohttp import web
+
+    async def handle(request):
+        body = await request.json()
+        print(json.dumps({"received": len(body.get("updates", [])), "updates": body.get("updates", [])}, indent=2))
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/", handle)
+    web.run_app(app, host="127.0.0.1", port=port)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "serve":
+        serve(int(sys.argv[2]) if len(sys.argv) > 2 else 8080)
+    else:
+        print("Usage: python export.py serve [port]")
@@ -0,0 +1,98 @@
+# history.py
+
+import json
+import os
+import struct
+import time
+from array import array
+from collections import OrderedDict
+
+# Each index record is (user_id, byte offset of the event in the guild's log)
+INDEX_RECORD = struct.Struct("<QQ")
+
+
+class HistoryStore:
+    """
+    Append-only event log, one JSON-lines file per guild, with a binary
+    (user_id, offset) index alongside it. The index lets /history seek straight
+    to a player's last N events instead of reading the whole log.
+    """
+
+    def __init__(self, directory: str, capacity: int = 64):
+        self.directory = directory
+        self.capacity = capacity
+        self._indexes = OrderedDict()  # {guild_id:int: {user_id:int: array("Q") of offsets}}
+        os.makedirs(directory, exist_ok=True)
+
+    def _log_path(self, guild_id: int) -> str:
+        return os.path.join(self.directory, f"{guild_id}.jsonl")
+
+    def _index_path(self, guild_id: int) -> str:
+        return os.path.join(self.directory, f"{guild_id}.idx")
+
+    def _index(self, guild_id: int) -> dict:
+        index = self._indexes.get(guild_id)
+        if index is not None:
+            self._indexes.move_to_end(guild_id)
+            return index
+
+        index = {}
+        idx_path = self._index_path(guild_id)
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                raw = f.read()
+            usable = len(raw) - len(raw) % INDEX_RECORD.size  # Ignore a torn trailing record
+            for user_id, offset in INDEX_RECORD.iter_unpack(raw[:usable]):
+                index.setdefault(user_id, array("Q")).append(offset)
+        elif os.path.exists(self._log_path(guild_id)):
+            index = self._rebuild_index(guild_id)
+
+        self._indexes[guild_id] = index
+        while len(self._indexes) > self.capacity:
+            self._indexes.popitem(last=False)
+        return index
+
+    def _rebuild_index(self, guild_id: int) -> dict:
+        """Recreates a missing index file with one pass over the log."""
+        index = {}
+        records = bytearray()
+        with open(self._log_path(guild_id), "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    user_id = int(json.loads(line)["user"])
+                except (ValueError, KeyError):
+                    offset += len(line)
+                    continue
+                index.setdefault(user_id, array("Q")).append(offset)
+                records += INDEX_RECORD.pack(user_id, offset)
+                offset += len(line)
+        with open(self._index_path(guild_id), "wb") as f:
+            f.write(records)
+        return index
+
+    def record(self, guild_id: int, user_id: int, kind: str, **fields):
+        """Appends one event for a player, e.g. record(g, u, "roll", roll=4, **{"from": 3, "to": 7})."""
+        index = self._index(guild_id)
+        event = {"ts": int(time.time()), "user": str(user_id), "kind": kind, **fields}
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+
+        with open(self._log_path(guild_id), "ab") as f:
+            offset = f.tell()
+            f.write(line)
+        with open(self._index_path(guild_id), "ab") as f:
+            f.write(INDEX_RECORD.pack(user_id, offset))
+        index.setdefault(user_id, array("Q")).append(offset)
+
+    def last(self, guild_id: int, user_id: int, count: int = 10) -> list:
+        """Returns the player's most recent `count` events, newest first."""
+        offsets = self._index(guild_id).get(user_id)
+        if not offsets or count <= 0:
+            return []
+
+        events = []
+        with open(self._log_path(guild_id), "rb") as f:
+            for offset in reversed(offsets[-count:]):
+                f.seek(offset)
+                events.append(json.loads(f.readline()))
+        return events
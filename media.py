@@ -0,0 +1,105 @@
+# media.py
+
+import asyncio
+import io
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import discord
+from PIL import Image
+
+from webclient import get_session
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# --- CONFIGURATION ---
+MAX_SUBMISSION_BYTES = 10 * 1024 * 1024  # Reject anything bigger than 10 MB
+ALLOWED_CONTENT_TYPES = {"image/png", "image/jpeg", "image/webp", "image/gif"}
+PREVIEW_MAX_SIDE = 1280  # Longest side of the compressed preview, in pixels
+PREVIEW_QUALITY = 80
+CHUNK_SIZE = 64 * 1024
+SPOOL_IN_MEMORY = 1024 * 1024  # Downloads bigger than this spill to a temp file
+# Post the original Discord CDN link instead of re-uploading the image.
+# Only turn this on if attachment URLs stay valid long enough for hosts to review.
+REFERENCE_CDN_URL = os.getenv("SNL_REFERENCE_CDN_URL", "0") == "1"
+
+_preview_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snl-preview")
+
+
+class SubmissionRejected(Exception):
+    """Raised when an attachment can't be accepted. The message is shown to the player."""
+
+
+def check_attachment(attachment: discord.Attachment):
+    """Validates type and size from the attachment metadata, before downloading anything."""
+    content_type = (attachment.content_type or "").split(";")[0].strip().lower()
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise SubmissionRejected("Submissions must be a PNG, JPEG, WEBP or GIF image.")
+    if attachment.size > MAX_SUBMISSION_BYTES:
+        raise SubmissionRejected(
+            f"That image is too large ({attachment.size // (1024 * 1024)} MB). "
+            f"The limit is {MAX_SUBMISSION_BYTES // (1024 * 1024)} MB."
+        )
+
+
+async def stream_attachment(attachment: discord.Attachment):
+    """Streams the attachment into a spooled temp file, enforcing the size cap as it goes."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_IN_MEMORY)
+    received = 0
+    try:
+        async with get_session().get(attachment.url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                received += len(chunk)
+                if received > MAX_SUBMISSION_BYTES:
+                    raise SubmissionRejected("That image is too large to submit.")
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def _make_preview(source) -> io.BytesIO:
+    """Downscales and re-encodes an image as JPEG. Runs in the preview worker pool."""
+    with Image.open(source) as img:
+        img.thumbnail((PREVIEW_MAX_SIDE, PREVIEW_MAX_SIDE))
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=PREVIEW_QUALITY, optimize=True)
+    out.seek(0)
+    return out
+
+
+async def prepare_submission(attachment: discord.Attachment):
+    """
+    Returns (file, image_url) for the submission post. Exactly one of them is set:
+    either a discord.File holding a compressed preview, or the original CDN URL.
+    """
+    check_attachment(attachment)
+
+    if REFERENCE_CDN_URL:
+        return None, attachment.url
+
+    spool = await stream_attachment(attachment)
+    try:
+        loop = asyncio.get_running_loop()
+        try:
+            preview = await loop.run_in_executor(_preview_pool, _make_preview, spool)
+        except Exception as e:
+            # Fall back to the original bytes if the image can't be decoded
+            logger.error(f"Could not build preview for {attachment.filename}: {e}")
+            spool.seek(0)
+            preview = io.BytesIO(spool.read())
+            return discord.File(preview, filename=attachment.filename), None
+    finally:
+        spool.close()
+
+    name = os.path.splitext(attachment.filename)[0] or "submission"
+    return discord.File(preview, filename=f"{name}.jpg"), None
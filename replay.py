@@ -0,0 +1,379 @@
+# replay.py
+"""
+Replays a trace recorded with SNL_TRACE_FILE through the bot's real handlers,
+offline, against stubbed Discord objects and a stubbed sheet.
+
+    python replay.py trace.jsonl --speed 10 --sheet-latency 0.8
+
+Discord API calls sleep for --api-latency, sheet calls block for --sheet-latency
+(gspread is synchronous, so this reproduces event-loop stalls). Any interaction
+acknowledged more than 3 seconds after it arrived fails with 10062, as it does live.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+
+import discord
+
+ACK_DEADLINE = 3.0
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+CHANNEL_NAMES = ["snl-commands", "snl-submissions", "snl-admin", "snl-chat", "other"]
+
+_ids = itertools.count(1)
+settings = types.SimpleNamespace(api_latency=0.1, sheet_latency=0.5)
+results = types.SimpleNamespace(acks=defaultdict(list), expired=defaultdict(int), errors=defaultdict(list), skipped=0)
+
+
+# --- STUB SHEET BACKEND ---
+def _stub_board(max_tile: int = 100) -> dict:
+    snakes = {17: 7, 54: 34, 62: 19, 64: 60, 87: 24, 93: 73, 95: 75, 98: 79}
+    ladders = {4: 14, 9: 31, 20: 38, 28: 84, 40: 59, 51: 67, 63: 81, 71: 91}
+    board = {}
+    for tile in range(1, max_tile + 1):
+        kind = "snake" if tile in snakes else "ladder" if tile in ladders else ""
+        board[tile] = {
+            "Tile": tile,
+            "Target": f"Target {tile}",
+            "Task": f"Obtain item {tile}",
+            "Drop Rate": f"1/{tile * 8}",
+            "Type": kind,
+            "End Tile": snakes.get(tile) or ladders.get(tile) or tile,
+            "Image": None,
+        }
+    return board
+
+
+def install_stub_sheets():
+    board = _stub_board()
+    module = types.ModuleType("sheets")
+
+    compiled = {"name": "main", "version": "stub", "tiles": board, "max_tile": max(board)}
+
+    def get_board(name="main"):
+        time.sleep(settings.sheet_latency)
+        return compiled if name == "main" else None
+
+    def list_boards():
+        time.sleep(settings.sheet_latency)
+        return ["main"]
+
+    def board_slug(title):
+        # Same rule as sheets.board_slug, so traced board names resolve the same way
+        return re.sub(r"[^a-z0-9_]+", "-", str(title).strip().lower()).strip("-")
+
+    def get_tile_data(tile_number, board="main"):
+        tile = get_board(board)["tiles"].get(tile_number)
+        return dict(tile) if tile else None
+
+    def get_max_tile(board="main"):
+        return get_board(board)["max_tile"]
+
+    module.get_board = get_board
+    module.list_boards = list_boards
+    module.board_slug = board_slug
+    module.get_tile_data = get_tile_data
+    module.get_max_tile = get_max_tile
+    sys.modules["sheets"] = module
+
+
+# --- STUB DISCORD OBJECTS ---
+def _expired():
+    return discord.NotFound(types.SimpleNamespace(status=404, reason="Not Found"), {"code": 10062, "message": "Unknown interaction"})
+
+
+async def _api_call():
+    await asyncio.sleep(settings.api_latency)
+
+
+class FakeRole:
+    def __init__(self, name: str):
+        self.id = next(_ids)
+        self.name = name
+        self.members = []
+        self.mention = f"<@&{self.id}>"
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = self.display_name = f"player-{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.roles = []
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None, file=None):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.attachments = [file] if file else []
+        self.mentions = []
+
+    async def add_reaction(self, emoji):
+        await _api_call()
+
+
+class FakeChannel:
+    def __init__(self, guild, name: str):
+        self.id = next(_ids)
+        self.guild = guild
+        self.name = name
+        self.messages = {}
+
+    async def send(self, content=None, *, embed=None, file=None, **kwargs):
+        await _api_call()
+        message = FakeMessage(self, content, embed, file)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int):
+        await _api_call()
+        message = self.messages.get(message_id)
+        if message is None:
+            raise discord.NotFound(types.SimpleNamespace(status=404, reason="Not Found"), {"code": 10008, "message": "Unknown Message"})
+        return message
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.text_channels = [FakeChannel(self, name) for name in CHANNEL_NAMES]
+        self.roles = [FakeRole("SNL"), FakeRole("SNL Host")]
+        self._members = {}
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    def member(self, user_id: int, roles: list = None) -> FakeMember:
+        """Returns the member, creating them and syncing their SNL roles from the trace."""
+        member = self._members.get(user_id)
+        if member is None:
+            member = self._members[user_id] = FakeMember(user_id)
+        if roles is not None:
+            member.roles = [role for role in self.roles if role.name in roles]
+            for role in self.roles:
+                if role in member.roles and member not in role.members:
+                    role.members.append(member)
+        return member
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+    def get_channel(self, channel_id: int):
+        return next((channel for channel in self.text_channels if channel.id == channel_id), None)
+
+    def channel(self, name: str) -> FakeChannel:
+        return discord.utils.get(self.text_channels, name=name)
+
+
+class FakeAttachment:
+    def __init__(self, size: int, content_type: str):
+        self.id = next(_ids)
+        self.size = size
+        self.content_type = content_type
+        self.filename = "submission.png"
+        self.url = f"https://cdn.example.invalid/attachments/{self.id}/submission.png"
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _ack(self):
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        await _api_call()
+        latency = time.monotonic() - self._interaction.created
+        results.acks[self._interaction.command_name].append(latency)
+        if latency > ACK_DEADLINE:
+            results.expired[self._interaction.command_name] += 1
+            raise _expired()
+        self._done = True
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False):
+        await self._ack()
+
+    async def edit_message(self, *, view=None, **kwargs):
+        await self._ack()
+
+    async def send_message(self, content=None, *, view=None, **kwargs):
+        await self._ack()
+        if view is not None:
+            self._interaction.replay.views[(self._interaction.guild.id, self._interaction.user.id)] = view
+
+
+class FakeFollowup:
+    async def send(self, content=None, **kwargs):
+        await _api_call()
+
+
+class FakeInteraction:
+    def __init__(self, replay, guild: FakeGuild, member: FakeMember, channel: FakeChannel, command_name: str):
+        self.id = next(_ids)
+        self.replay = replay
+        self.created = time.monotonic()
+        self.created_at = discord.utils.utcnow()
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = member
+        self.channel = channel
+        self.command_name = command_name
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup()
+        self.data = {}
+
+
+# --- REPLAY ---
+class Replay:
+    def __init__(self, bot_module):
+        self.bot_module = bot_module
+        self.guilds = {}
+        self.views = {}  # {(guild_id, user_id): last View sent to that user}
+        bot_module.bot.get_guild = self.guilds.get
+
+    def guild(self, guild_id: int) -> FakeGuild:
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            guild = self.guilds[guild_id] = FakeGuild(guild_id)
+        return guild
+
+    def _arguments(self, guild: FakeGuild, options: dict) -> dict:
+        kwargs = {}
+        for name, value in options.items():
+            if isinstance(value, dict) and "user" in value:
+                kwargs[name] = guild.member(value["user"], value.get("roles"))
+            elif isinstance(value, dict) and "attachment" in value:
+                kwargs[name] = FakeAttachment(value["attachment"]["size"], value["attachment"]["content_type"])
+            else:
+                kwargs[name] = value
+        return kwargs
+
+    async def _guarded(self, name: str, coro):
+        try:
+            await coro
+        except Exception as e:
+            results.errors[name].append(f"{type(e).__name__}: {e}")
+
+    async def dispatch(self, event: dict):
+        guild = self.guild(event["guild"])
+        member = guild.member(event["user"], event.get("roles"))
+        kind = event["type"]
+
+        if kind == "command":
+            command = self.bot_module.bot.tree.get_command(event["command"])
+            if command is None:
+                results.skipped += 1
+                return
+            interaction = FakeInteraction(self, guild, member, guild.channel(event["channel"]), command.name)
+            await self._guarded(command.name, command.callback(interaction, **self._arguments(guild, event.get("options", {}))))
+
+        elif kind == "component":
+            view = self.views.pop((guild.id, member.id), None)
+            if view is None or not view.children:
+                results.skipped += 1
+                return
+            interaction = FakeInteraction(self, guild, member, guild.channel(event["channel"]), "component")
+            await self._guarded("component", view.children[0].callback(interaction))
+
+        elif kind == "reaction":
+            channel = guild.channel(event["channel"])
+            info = self.bot_module.pending_submissions.get((guild.id, event.get("submitter"), event.get("board")))
+            payload = types.SimpleNamespace(
+                emoji=event["emoji"],
+                guild_id=guild.id,
+                user_id=member.id,
+                channel_id=channel.id,
+                message_id=info["message_id"] if info else 0,
+                member=member,
+            )
+            await self._guarded("reaction", self.bot_module.on_raw_reaction_add(payload))
+
+    async def run(self, events: list, speed: float):
+        tasks = []
+        start = time.monotonic()
+        first = events[0]["t"]
+        for event in events:
+            delay = (event["t"] - first) / speed - (time.monotonic() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.dispatch(event)))
+        await asyncio.gather(*tasks)
+        return time.monotonic() - start
+
+
+def load_trace(path: str) -> list:
+    with open(path, "r") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    events.sort(key=lambda event: event["t"])
+    return events
+
+
+def report(elapsed: float):
+    print(f"\nReplay finished in {elapsed:.1f}s")
+    print(f"{'command':<14}{'acks':>6}{'p50':>8}{'p95':>8}{'max':>8}{'10062':>7}")
+    for name, latencies in sorted(results.acks.items()):
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{name:<14}{len(latencies):>6}{statistics.median(latencies):>8.2f}{p95:>8.2f}{latencies[-1]:>8.2f}{results.expired[name]:>7}")
+    for name, errors in sorted(results.errors.items()):
+        print(f"\n{name}: {len(errors)} error(s), e.g. {errors[0]}")
+    if results.skipped:
+        print(f"\nSkipped {results.skipped} event(s) with no matching command or view.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded SNL trace against stubbed Discord and sheet backends.")
+    parser.add_argument("trace", help="Trace file recorded with SNL_TRACE_FILE")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier, e.g. 1, 10 or 100")
+    parser.add_argument("--api-latency", type=float, default=settings.api_latency, help="Seconds per stubbed Discord API call")
+    parser.add_argument("--sheet-latency", type=float, default=settings.sheet_latency, help="Seconds each stubbed sheet call blocks for")
+    args = parser.parse_args()
+
+    settings.api_latency = args.api_latency
+    settings.sheet_latency = args.sheet_latency
+    events = load_trace(args.trace)
+    if not events:
+        print("Trace is empty.")
+        return
+
+    # Run against throwaway state so replays never touch the live data
+    workdir = tempfile.mkdtemp(prefix="snl-replay-")
+    shutil.copy(os.path.join(REPO_DIR, "board.jpg"), workdir)
+    os.chdir(workdir)
+    os.environ.pop("SNL_TRACE_FILE", None)
+    os.environ["SNL_REFERENCE_CDN_URL"] = "1"  # Don't download the fake attachments
+    sys.path.insert(0, REPO_DIR)
+    install_stub_sheets()
+
+    import bot as bot_module
+    bot_module.exporter.url = None  # Never push replayed state to the dashboards
+
+    print(f"Replaying {len(events)} event(s) at {args.speed:g}x in {workdir}")
+    elapsed = asyncio.run(Replay(bot_module).run(events, args.speed))
+    report(elapsed)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
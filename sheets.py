@@ -1,9 +1,17 @@
 # sheets.py
 
+import hashlib
+import json
+import os
+import re
+import time
+
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import logging
 
+from state import DEFAULT_BOARD
+
 # Setup logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -13,17 +21,23 @@ scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/au
 creds = ServiceAccountCredentials.from_json_keyfile_name("/home/brett_david_woodworth/SNL_Bot/creds.json", scope)
 client = gspread.authorize(creds)
 
-# Open the sheet (replace with your actual sheet name)
-sheet = client.open("OSRS Events").sheet1  # Adjust if it's not the first worksheet
+# Open the spreadsheet (replace with your actual sheet name). The first worksheet is the default board.
+spreadsheet = client.open("OSRS Events")
+sheet = spreadsheet.sheet1
+
+BOARD_TTL = 60  # Seconds before a board's rows are re-read to look for changes
+DEFAULT_MAX_TILE = 100
+LOCAL_BOARD_DIR = "boards"  # Local boards: boards/<name>.json, a list of rows with the sheet's headers
 
-def get_tile_data(tile_number):
-    # Load all rows from the sheet, starting from the 3rd row as headers per your note
-    try:
-        rows = sheet.get_all_records(head=3)
-    except Exception as e:
-        logger.error(f"Error loading rows in get_tile_data(): {e}")
-        return None
 
+def board_slug(title: str) -> str:
+    """Board names as players type them, and as they appear in state file names: lowercase, dashes for anything else."""
+    return re.sub(r"[^a-z0-9_]+", "-", str(title).strip().lower()).strip("-")
+
+
+def _compile_board(rows):
+    """Builds the tile index from sheet rows. The version is a hash of the rows, so it only changes with the sheet."""
+    tiles = {}
     for row in rows:
         tile_str = str(row.get("Tile", "")).strip()
         if tile_str == "":
@@ -32,37 +46,139 @@ def get_tile_data(tile_number):
         try:
             tile = int(tile_str)
         except ValueError:
-            print(f"Skipping invalid row in get_tile_data(): invalid literal for int() with base 10: '{tile_str}'")
+            print(f"Skipping invalid row in _compile_board(): invalid literal for int() with base 10: '{tile_str}'")
             continue
-        
-        if tile == tile_number:
-            # Safely parse End Tile, fallback to tile_number if missing or invalid
-            try:
-                end_tile = int(row.get("End Tile", tile))
-            except (TypeError, ValueError):
-                end_tile = tile
-            
-            tile_data = {
-                "Tile": tile,
-                "Target": row.get("Target", ""),
-                "Task": row.get("Task", ""),
-                "Drop Rate": row.get("Drop Rate", ""),
-                "Type": row.get("Type", "").lower(),
-                "End Tile": end_tile,
-                "Image": row.get("Target Image", None),
-            }
-            return tile_data
-    return None  # no matching tile found
-
-def get_max_tile():
+
+        # Safely parse End Tile, fallback to the tile itself if missing or invalid
+        try:
+            end_tile = int(row.get("End Tile", tile))
+        except (TypeError, ValueError):
+            end_tile = tile
+
+        tiles.setdefault(tile, {
+            "Tile": tile,
+            "Target": row.get("Target", ""),
+            "Task": row.get("Task", ""),
+            "Drop Rate": row.get("Drop Rate", ""),
+            "Type": str(row.get("Type", "")).lower(),
+            "End Tile": end_tile,
+            "Image": row.get("Target Image", None),
+        })
+
+    version = hashlib.sha1(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()
+    return {"version": version, "tiles": tiles, "max_tile": max(tiles) if tiles else DEFAULT_MAX_TILE}
+
+
+class Board:
+    """A board's source (a worksheet or a local JSON file) and its compiled tile index."""
+
+    def __init__(self, name: str, worksheet=None, path: str = None):
+        self.name = name
+        self.worksheet = worksheet
+        self.path = path
+        self._compiled = None
+        self._loaded_at = 0.0
+
+    def _read_rows(self):
+        if self.path:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        # The 3rd row of a worksheet holds the headers
+        return self.worksheet.get_all_records(head=3)
+
+    def get(self):
+        """
+        Returns the compiled board, re-reading the source at most once every BOARD_TTL seconds.
+        If the source can't be read, the last good board is kept.
+        """
+        if self._compiled is not None and time.monotonic() - self._loaded_at < BOARD_TTL:
+            return self._compiled
+
+        try:
+            rows = self._read_rows()
+        except Exception as e:
+            logger.error(f"Error loading rows for board '{self.name}': {e}")
+            if self._compiled is None:
+                return {"name": self.name, "version": None, "tiles": {}, "max_tile": DEFAULT_MAX_TILE}
+            return self._compiled
+
+        compiled = _compile_board(rows)
+        if self._compiled is None or compiled["version"] != self._compiled["version"]:
+            compiled["name"] = self.name
+            self._compiled = compiled
+        self._loaded_at = time.monotonic()
+        return self._compiled
+
+
+_boards = {DEFAULT_BOARD: Board(DEFAULT_BOARD, worksheet=sheet)}  # {name: Board}
+_boards_listed_at = 0.0
+_reported_collisions = set()  # Sources already logged as shadowed, so each is only reported once
+
+
+def _name_taken(name: str, boards: dict, source: str) -> bool:
+    """True if `name` is the default board or already listed, logging the source that would have shadowed it."""
+    if name != DEFAULT_BOARD and name not in boards:
+        return False
+    if source not in _reported_collisions:
+        _reported_collisions.add(source)
+        logger.warning(f"Ignoring board {source}: its name '{name}' is already taken")
+    return True
+
+
+def list_boards():
     """
-    Return the highest tile number from the sheet.
-    Assumes the third row contains headers.
+    Returns the available board names: the default board, every other worksheet in the
+    spreadsheet, and every local board file. Refreshed at most once every BOARD_TTL seconds.
     """
+    global _boards, _boards_listed_at
+    if time.monotonic() - _boards_listed_at < BOARD_TTL:
+        return sorted(_boards)
+
+    boards = {DEFAULT_BOARD: _boards[DEFAULT_BOARD]}
     try:
-        records = sheet.get_all_records(head=3)
-        tile_numbers = [int(row["Tile"]) for row in records if str(row["Tile"]).isdigit()]
-        return max(tile_numbers) if tile_numbers else 100
+        for worksheet in spreadsheet.worksheets():
+            if worksheet.id == sheet.id:
+                continue
+            name = board_slug(worksheet.title)
+            if not name or _name_taken(name, boards, f"worksheet '{worksheet.title}'"):
+                continue
+            existing = _boards.get(name)
+            boards[name] = existing if existing is not None and existing.worksheet is not None else Board(name, worksheet=worksheet)
     except Exception as e:
-        logger.error(f"Could not fetch records in get_max_tile(): {e}")
-        return 100
+        logger.error(f"Could not list worksheets in list_boards(): {e}")
+        boards.update({name: board for name, board in _boards.items() if board.worksheet is not None})
+
+    if os.path.isdir(LOCAL_BOARD_DIR):
+        for filename in os.listdir(LOCAL_BOARD_DIR):
+            stem, ext = os.path.splitext(filename)
+            if ext != ".json":
+                continue
+            name = board_slug(stem)
+            if not name or _name_taken(name, boards, f"file '{filename}'"):
+                continue
+            existing = _boards.get(name)
+            boards[name] = existing if existing is not None and existing.path else Board(name, path=os.path.join(LOCAL_BOARD_DIR, filename))
+
+    _boards = boards  # Swapped in whole, since worker threads read it concurrently
+    _boards_listed_at = time.monotonic()
+    return sorted(_boards)
+
+
+def get_board(name: str = DEFAULT_BOARD):
+    """Returns the compiled board {"name", "version", "tiles", "max_tile"}, or None if there is no such board."""
+    board = _boards.get(name)
+    if board is None and name in list_boards():
+        board = _boards.get(name)
+    return board.get() if board else None
+
+
+def get_tile_data(tile_number, board: str = DEFAULT_BOARD):
+    compiled = get_board(board)
+    tile_data = compiled["tiles"].get(tile_number) if compiled else None
+    return dict(tile_data) if tile_data else None  # no matching tile found
+
+
+def get_max_tile(board: str = DEFAULT_BOARD):
+    """Return the highest tile number on the board."""
+    compiled = get_board(board)
+    return compiled["max_tile"] if compiled else DEFAULT_MAX_TILE
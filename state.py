@@ -0,0 +1,428 @@
+# state.py
+
+import json
+import os
+import time
+import weakref
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+DEFAULT_BOARD = "main"  # The board a guild plays on unless a command names another
+
+# Defaults for a player the bot hasn't seen yet
+DEFAULT_POSITION = 1
+DEFAULT_ROLLS = 0
+DEFAULT_APPROVED = True
+# Defaults for a player's first touch in a game that has been /reset
+RESET_POSITION = 0
+RESET_ROLLS = 1
+
+LEGACY_SECTIONS = ("positions", "rolls", "approvals", "podium")
+TOP_FAILED_TILES = 3
+
+
+class PlayerState:
+    """One player's progress in a guild's game."""
+    __slots__ = ("user_id", "position", "rolls", "approved")
+
+    def __init__(self, user_id: int, position: int = DEFAULT_POSITION, rolls: int = DEFAULT_ROLLS, approved: bool = DEFAULT_APPROVED):
+        self.user_id = user_id
+        self.position = position
+        self.rolls = rolls
+        self.approved = approved
+
+    def __repr__(self):
+        return f"PlayerState(user_id={self.user_id}, position={self.position}, rolls={self.rolls}, approved={self.approved})"
+
+
+class GameStats:
+    """
+    Rolling aggregates for one game, updated as events happen so /stats is O(1).
+    A "failed" tile is one where a player had to resubmit before a host approved it.
+    """
+    __slots__ = ("rolls", "snakes", "ladders", "rollers", "approvals", "approval_seconds", "tile_failures", "top_failed")
+
+    def __init__(self):
+        self.rolls = 0
+        self.snakes = 0
+        self.ladders = 0
+        self.rollers = set()        # {user_id:int} who have rolled at least once
+        self.approvals = 0
+        self.approval_seconds = 0.0  # Sum of /submit -> ✅ turnaround
+        self.tile_failures = {}     # {tile:int: resubmissions}
+        self.top_failed = []        # [(failures, tile)], highest first, at most TOP_FAILED_TILES
+
+    def record_roll(self, user_id: int, snake_ladder: str = ""):
+        self.rolls += 1
+        self.rollers.add(user_id)
+        if snake_ladder == "snake":
+            self.snakes += 1
+        elif snake_ladder == "ladder":
+            self.ladders += 1
+
+    def record_approval(self, turnaround_seconds: float):
+        self.approvals += 1
+        self.approval_seconds += max(0.0, turnaround_seconds)
+
+    def record_failure(self, tile: int):
+        count = self.tile_failures.get(tile, 0) + 1
+        self.tile_failures[tile] = count
+        # Counts only grow, so the top list can be maintained in place
+        top = [entry for entry in self.top_failed if entry[1] != tile]
+        top.append((count, tile))
+        top.sort(key=lambda entry: (-entry[0], entry[1]))
+        self.top_failed = top[:TOP_FAILED_TILES]
+
+    @property
+    def average_rolls(self) -> float:
+        return self.rolls / len(self.rollers) if self.rollers else 0.0
+
+    @property
+    def average_approval_seconds(self) -> float:
+        return self.approval_seconds / self.approvals if self.approvals else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "rolls": self.rolls,
+            "snakes": self.snakes,
+            "ladders": self.ladders,
+            "rollers": [str(uid) for uid in self.rollers],
+            "approvals": self.approvals,
+            "approval_seconds": self.approval_seconds,
+            "tile_failures": {str(tile): count for tile, count in self.tile_failures.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict):
+        stats = cls()
+        stats.rolls = int(raw.get("rolls", 0))
+        stats.snakes = int(raw.get("snakes", 0))
+        stats.ladders = int(raw.get("ladders", 0))
+        stats.rollers = {int(uid) for uid in raw.get("rollers", [])}
+        stats.approvals = int(raw.get("approvals", 0))
+        stats.approval_seconds = float(raw.get("approval_seconds", 0.0))
+        for tile, count in raw.get("tile_failures", {}).items():
+            stats.tile_failures[int(tile)] = int(count)
+        stats.top_failed = sorted(((count, tile) for tile, count in stats.tile_failures.items()), key=lambda entry: (-entry[0], entry[1]))[:TOP_FAILED_TILES]
+        return stats
+
+
+class GuildState:
+    """
+    One guild's game on one board: its players, the podium and the game's running stats.
+    Keeps a sorted (-position, user_id) index so rankings don't need a full sort.
+    `generation` counts resets; players are only created when they first touch the current one.
+    """
+    __slots__ = ("guild_id", "board", "generation", "players", "podium", "stats", "_places", "_order", "__weakref__")
+
+    def __init__(self, guild_id: int, board: str = DEFAULT_BOARD):
+        self.guild_id = guild_id
+        self.board = board
+        self.generation = 0
+        self.players = {}   # {user_id:int: PlayerState}
+        self.podium = []    # [user_id:int] in finishing order
+        self.stats = GameStats()
+        self._places = {}   # {user_id:int: 1-based podium place}
+        self._order = []    # sorted [(-position, user_id)]
+
+    # --- players ---
+    def get(self, user_id: int):
+        """Returns the player, or None if they haven't played in the current game."""
+        return self.players.get(user_id)
+
+    @property
+    def start_position(self) -> int:
+        return RESET_POSITION if self.generation else DEFAULT_POSITION
+
+    @property
+    def start_rolls(self) -> int:
+        return RESET_ROLLS if self.generation else DEFAULT_ROLLS
+
+    def player(self, user_id: int) -> PlayerState:
+        """Returns the player, creating them with the current game's starting values on first touch."""
+        player = self.players.get(user_id)
+        if player is None:
+            player = PlayerState(user_id, self.start_position, self.start_rolls)
+            self._add(player)
+        return player
+
+    def _add(self, player: PlayerState):
+        self.players[player.user_id] = player
+        insort(self._order, (-player.position, player.user_id))
+
+    def move(self, player: PlayerState, tile: int):
+        """Sets a player's position and keeps the ranking index in step."""
+        if tile == player.position:
+            return
+        key = (-player.position, player.user_id)
+        idx = bisect_left(self._order, key)
+        if idx < len(self._order) and self._order[idx] == key:
+            del self._order[idx]
+        player.position = tile
+        insort(self._order, (-tile, player.user_id))
+
+    def ranked(self):
+        """Yields players ordered by position, highest tile first."""
+        players = self.players
+        for _, user_id in self._order:
+            yield players[user_id]
+
+    # --- podium ---
+    def podium_place(self, user_id: int):
+        """Returns the 1-based podium place, or None if the player hasn't finished."""
+        return self._places.get(user_id)
+
+    def finish(self, user_id: int) -> int:
+        """Adds a player to the podium (once) and returns their place."""
+        place = self._places.get(user_id)
+        if place is None:
+            self.podium.append(user_id)
+            place = self._places[user_id] = len(self.podium)
+        return place
+
+    def reset(self) -> "GuildState":
+        """
+        Starts a new game in constant time by swapping in empty containers and bumping the
+        generation. Returns the finished game, detached, so it can be archived off the event loop.
+        """
+        finished = GuildState(self.guild_id, self.board)
+        finished.generation = self.generation
+        finished.players, finished.podium, finished.stats = self.players, self.podium, self.stats
+        finished._places, finished._order = self._places, self._order
+
+        self.generation += 1
+        self.players = {}
+        self.podium = []
+        self.stats = GameStats()
+        self._places = {}
+        self._order = []
+        return finished
+
+    # --- legacy data.json layout ---
+    @classmethod
+    def from_legacy(cls, guild_id: int, positions: dict, rolls: dict, approvals: dict, podium: list, board: str = DEFAULT_BOARD):
+        guild = cls(guild_id, board)
+        for uid in set(positions) | set(rolls) | set(approvals):
+            guild._add(PlayerState(
+                int(uid),
+                int(positions.get(uid, DEFAULT_POSITION)),
+                int(rolls.get(uid, DEFAULT_ROLLS)),
+                bool(approvals.get(uid, DEFAULT_APPROVED)),
+            ))
+        for uid in podium:
+            guild.finish(int(uid))
+        return guild
+
+    def to_legacy(self):
+        """Returns (positions, rolls, approvals, podium) in the string-keyed data.json shape."""
+        positions, rolls, approvals = {}, {}, {}
+        for user_id, player in self.players.items():
+            uid = str(user_id)
+            positions[uid] = player.position
+            rolls[uid] = player.rolls
+            approvals[uid] = player.approved
+        return positions, rolls, approvals, [str(uid) for uid in self.podium]
+
+    # --- per-guild partition file ---
+    @classmethod
+    def from_partition(cls, guild_id: int, raw: dict, board: str = DEFAULT_BOARD):
+        guild = cls.from_legacy(guild_id, raw.get("positions", {}), raw.get("rolls", {}), raw.get("approvals", {}), raw.get("podium", []), board)
+        guild.stats = GameStats.from_dict(raw.get("stats", {}))
+        guild.generation = int(raw.get("generation", 0))
+        return guild
+
+    def to_partition(self) -> dict:
+        positions, rolls, approvals, podium = self.to_legacy()
+        return {"generation": self.generation, "positions": positions, "rolls": rolls, "approvals": approvals, "podium": podium, "stats": self.stats.to_dict()}
+
+
+class GameState:
+    """Every guild's game on the default board, loaded from and saved to the data.json layout."""
+
+    def __init__(self):
+        self.guilds = {}  # {guild_id:int: GuildState}
+        # Non-guild entries found in data.json, kept as-is so a load/save round trip doesn't drop them
+        self.extras = {section: {} for section in LEGACY_SECTIONS}
+
+    def guild(self, guild_id: int) -> GuildState:
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            guild = self.guilds[guild_id] = GuildState(guild_id)
+        return guild
+
+    @classmethod
+    def from_legacy(cls, raw: dict):
+        state = cls()
+        sections = {name: raw.get(name) if isinstance(raw.get(name), dict) else {} for name in LEGACY_SECTIONS}
+
+        guild_ids = set()
+        for name, section in sections.items():
+            for gid, value in section.items():
+                expected = list if name == "podium" else dict
+                if isinstance(value, expected):
+                    guild_ids.add(gid)
+                else:
+                    state.extras[name][gid] = value
+
+        for gid in guild_ids:
+            def part(name, empty):
+                value = sections[name].get(gid, empty)
+                return value if isinstance(value, type(empty)) else empty
+
+            state.guilds[int(gid)] = GuildState.from_legacy(
+                int(gid), part("positions", {}), part("rolls", {}), part("approvals", {}), part("podium", [])
+            )
+        return state
+
+    def to_legacy(self) -> dict:
+        raw = {section: dict(self.extras[section]) for section in LEGACY_SECTIONS}
+        for guild_id, guild in self.guilds.items():
+            gid = str(guild_id)
+            raw["positions"][gid], raw["rolls"][gid], raw["approvals"][gid], raw["podium"][gid] = guild.to_legacy()
+        return raw
+
+
+class StateStore:
+    """
+    Game state partitioned into one JSON file per (guild, board): <guild>.json for the
+    default board, <guild>.<board>.json for the others. A game is loaded on its first
+    activity, kept in an LRU of `capacity` games, and only dirty partitions are written back.
+    """
+    EXTRAS_FILE = "_extras.json"
+    ARCHIVE_DIR = "archive"
+
+    def __init__(self, directory: str, legacy_file: str = None, capacity: int = 64):
+        self.directory = directory
+        self.capacity = capacity
+        self._cache = OrderedDict()  # {(guild_id:int, board:str): GuildState}, least recently used first
+        # Evicted guilds a handler may still hold across an await; reused instead of reloading a stale copy
+        self._alive = weakref.WeakValueDictionary()
+        self._dirty = set()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+            if legacy_file and os.path.exists(legacy_file):
+                self._migrate(legacy_file)
+        self._boards = self._scan_boards()  # {guild_id:int: {board}} with a partition on disk
+
+    def _path(self, guild_id: int, board: str = DEFAULT_BOARD) -> str:
+        if board == DEFAULT_BOARD:
+            return os.path.join(self.directory, f"{guild_id}.json")
+        return os.path.join(self.directory, f"{guild_id}.{board}.json")
+
+    def _write(self, path: str, raw: dict):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(raw, f, indent=4)
+        os.replace(tmp, path)
+
+    def _migrate(self, legacy_file: str):
+        """Splits an old single-file data.json into per-guild partitions."""
+        with open(legacy_file, "r") as f:
+            state = GameState.from_legacy(json.load(f))
+        for guild_id, guild in state.guilds.items():
+            self._write(self._path(guild_id), guild.to_partition())
+        if any(state.extras.values()):
+            self._write(os.path.join(self.directory, self.EXTRAS_FILE), state.extras)
+        print(f"Migrated {len(state.guilds)} guild(s) from {legacy_file} into {self.directory}/")
+
+    def game(self, guild_id: int, board: str = DEFAULT_BOARD) -> GuildState:
+        """Returns the guild's game on a board, loading its partition on first use."""
+        key = (guild_id, board)
+        guild = self._cache.get(key)
+        if guild is not None:
+            self._cache.move_to_end(key)
+            return guild
+
+        guild = self._alive.get(key)
+        if guild is None:
+            path = self._path(guild_id, board)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    guild = GuildState.from_partition(guild_id, json.load(f), board)
+            else:
+                guild = GuildState(guild_id, board)
+            self._alive[key] = guild
+
+        self._cache[key] = guild
+        self._evict()
+        return guild
+
+    def _scan_boards(self) -> dict:
+        """Lists the partition files once, so boards() doesn't have to touch the disk."""
+        boards = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            gid, _, board = name[:-len(".json")].partition(".")
+            if gid.isdigit():
+                boards.setdefault(int(gid), set()).add(board or DEFAULT_BOARD)  # <guild>.json is the default board
+        return boards
+
+    def boards(self, guild_id: int) -> list:
+        """Names of the boards the guild has a game on, loaded or not."""
+        names = {board for (g_id, board) in self._cache if g_id == guild_id}
+        return sorted(names | self._boards.get(guild_id, set()))
+
+    def _evict(self):
+        while len(self._cache) > self.capacity:
+            key, guild = self._cache.popitem(last=False)
+            if key in self._dirty:
+                self._persist(guild)
+
+    def mark_dirty(self, guild: GuildState):
+        self._dirty.add((guild.guild_id, guild.board))
+
+    def _persist(self, guild: GuildState):
+        self._write(self._path(guild.guild_id, guild.board), guild.to_partition())
+        self._boards.setdefault(guild.guild_id, set()).add(guild.board)
+        self._dirty.discard((guild.guild_id, guild.board))
+
+    def flush(self):
+        """Writes every dirty partition."""
+        for key in list(self._dirty):
+            guild = self._cache.get(key) or self._alive.get(key)
+            if guild is None:
+                self._dirty.discard(key)
+                continue
+            self._persist(guild)
+
+    def save(self, guild: GuildState):
+        """Marks the guild dirty and writes it out."""
+        self.mark_dirty(guild)
+        self._persist(guild)
+
+    def archive(self, finished: GuildState):
+        """
+        Appends a finished game's final standings to <directory>/archive/, one JSON line per
+        game in a file named like its partition. Serialises every player, so call it off the event loop.
+        """
+        archive_dir = os.path.join(self.directory, self.ARCHIVE_DIR)
+        os.makedirs(archive_dir, exist_ok=True)
+        name = os.path.basename(self._path(finished.guild_id, finished.board)) + "l"  # .json -> .jsonl
+        record = {
+            "archived": int(time.time()),
+            "guild": str(finished.guild_id),
+            "board": finished.board,
+            "generation": finished.generation,
+            "podium": [str(uid) for uid in finished.podium],
+            "standings": [{"user": str(p.user_id), "position": p.position} for p in finished.ranked()],
+            "stats": finished.stats.to_dict(),
+        }
+        with open(os.path.join(archive_dir, name), "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def dump_legacy(self) -> dict:
+        """Rebuilds the old single-file data.json layout from every default-board partition on disk."""
+        self.flush()
+        state = GameState()
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            if ext != ".json" or not stem.isdigit():
+                continue
+            with open(os.path.join(self.directory, name), "r") as f:
+                state.guilds[int(stem)] = GuildState.from_partition(int(stem), json.load(f))
+        extras_path = os.path.join(self.directory, self.EXTRAS_FILE)
+        if os.path.exists(extras_path):
+            with open(extras_path, "r") as f:
+                state.extras.update(json.load(f))
+        return state.to_legacy()
@@ -0,0 +1,52 @@
+# tiles.py
+
+import discord
+
+# Leaderboard column widths
+TARGET_WIDTH = 20
+TASK_WIDTH = 30
+
+
+def _truncate(text, width: int) -> str:
+    text = str(text)
+    return (text[:width] + "...") if len(text) > width + 3 else text
+
+
+class TileTemplate:
+    """Everything about a tile that doesn't depend on the player, built once per board version."""
+    __slots__ = ("tile", "embed", "short_target", "short_task", "summary")
+
+    def __init__(self, tile_data: dict):
+        self.tile = tile_data["Tile"]
+
+        embed = discord.Embed(title=f"Tile {self.tile}", color=discord.Color.gold())
+        embed.add_field(name="Target", value=tile_data["Target"], inline=True)
+        embed.add_field(name="Task", value=tile_data["Task"], inline=True)
+        embed.add_field(name="Drop Rate", value=tile_data["Drop Rate"], inline=True)
+        image_url = tile_data.get("Image")
+        if image_url and isinstance(image_url, str) and image_url.startswith("http"):
+            embed.set_image(url=image_url)
+        self.embed = embed
+
+        self.short_target = _truncate(tile_data["Target"], TARGET_WIDTH)
+        self.short_task = _truncate(tile_data["Task"], TASK_WIDTH)
+        self.summary = (
+            f"**Tile {self.tile}**, **{tile_data['Task']}** from "
+            f"**{tile_data['Target']}** ({tile_data['Drop Rate']})"
+        )
+
+    def make_embed(self) -> discord.Embed:
+        """Returns a copy of the tile embed that the caller is free to modify."""
+        return self.embed.copy()
+
+
+_templates = {}  # {board name: (version, {tile:int: TileTemplate})}
+
+
+def get_templates(board: dict) -> dict:
+    """Returns the tile templates for a compiled board, rebuilding them only when that board's version changes."""
+    cached = _templates.get(board["name"])
+    if cached is None or cached[0] != board["version"] or board["version"] is None:
+        templates = {tile: TileTemplate(tile_data) for tile, tile_data in board["tiles"].items()}
+        cached = _templates[board["name"]] = (board["version"], templates)
+    return cached[1]
@@ -0,0 +1,22 @@
+# webclient.py
+
+import aiohttp
+
+_session = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Returns the bot's shared pooled HTTP session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=60, sock_read=15)
+        _session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None